@@ -9,7 +9,11 @@ from typing import Dict, List
 
 
 def load_report(path: Path) -> Dict[str, float]:
-    data = json.loads(path.read_text())
+    if path.is_dir():
+        # Columnar stores keep per-strategy averages in a small index, so responses are never read.
+        data = json.loads((path / "index.json").read_text())["strategies"]
+    else:
+        data = json.loads(path.read_text())
     return {name: details["average_score"] for name, details in data.items()}
 
 
@@ -83,7 +87,7 @@ def build_svg(reports: Dict[str, Dict[str, float]], width: int = 900, height: in
 
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--reports", nargs="+", required=True, help="Paths to JSON reports")
+    parser.add_argument("--reports", nargs="+", required=True, help="Paths to JSON reports or columnar report directories")
     parser.add_argument("--labels", nargs="*", help="Optional labels for each report")
     parser.add_argument("--output", type=Path, default=Path("analysis/figures/strategy_scores.svg"))
     args = parser.parse_args()
@@ -0,0 +1,182 @@
+"""Benchmark the experiment harness and save results for regression comparison.
+
+Measures end-to-end runner throughput against a latency-simulating client,
+scheduling overhead of ``gather_with_concurrency``, scoring and prompt
+building throughput and dataset load time. Results are written as JSON; pass ``--compare`` with a
+previous results file to print relative changes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.evaluation import compute_alignment_gap, score_conflict_response
+from pref_gap_experiments.llm import gather_with_concurrency
+from pref_gap_experiments.strategies import build_prompts_many
+from pref_gap_experiments.experiments import STRATEGY_REGISTRY
+from pref_gap_experiments.simulation import LatencyProfile, generate_scenarios, synthetic_client, write_scenarios_jsonl
+
+STRATEGIES = [StrategyConfig(name="baseline"), StrategyConfig(name="ranked_values"), StrategyConfig(name="safety_append")]
+
+
+def timed(function: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall time of ``repeat`` runs of ``function``."""
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_runner(args: argparse.Namespace) -> Dict[str, float]:
+    scenarios = list(generate_scenarios(args.scenarios, seed=args.seed))
+    profile = LatencyProfile(median_latency=args.latency, error_rate=args.error_rate)
+    config = ExperimentConfig(
+        scenarios=scenarios, strategies=STRATEGIES, llm_model="synthetic", parallelism=args.parallelism
+    )
+
+    def run() -> None:
+        client = synthetic_client(profile, seed=args.seed)
+        asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    seconds = timed(run, args.repeat)
+    units = len(scenarios) * len(STRATEGIES)
+    # Mean per-call time: the log-normal time to first token plus generating the completion.
+    per_call = profile.median_latency * math.exp(profile.latency_sigma**2 / 2)
+    per_call += profile.completion_tokens / profile.tokens_per_second
+    ideal = 2 * units * per_call / args.parallelism
+    return {"seconds": seconds, "units_per_second": units / seconds, "ideal_seconds": ideal}
+
+
+def bench_scheduler(args: argparse.Namespace) -> Dict[str, float]:
+    async def noop(value: int) -> int:
+        return value
+
+    def run() -> None:
+        asyncio.run(gather_with_concurrency(args.parallelism, (noop(i) for i in range(args.tasks))))
+
+    seconds = timed(run, args.repeat)
+    return {"seconds": seconds, "microseconds_per_task": seconds / args.tasks * 1e6}
+
+
+def bench_scoring(args: argparse.Namespace) -> Dict[str, float]:
+    scenarios = list(generate_scenarios(args.tasks, values_per_scenario=6, seed=args.seed))
+    responses = [" ".join(scenario.target_ranking[::2]) + " filler text " * 40 for scenario in scenarios]
+    rankings = [scenario.target_ranking[::-1] for scenario in scenarios]
+
+    def score() -> None:
+        for scenario, response in zip(scenarios, responses):
+            score_conflict_response(scenario, response, response)
+
+    def gap() -> None:
+        for scenario, ranking in zip(scenarios, rankings):
+            compute_alignment_gap(scenario.target_ranking, ranking)
+
+    score_seconds = timed(score, args.repeat)
+    gap_seconds = timed(gap, args.repeat)
+    return {
+        "score_per_second": len(scenarios) / score_seconds,
+        "alignment_gap_per_second": len(scenarios) / gap_seconds,
+    }
+
+
+def bench_prompts(args: argparse.Namespace) -> Dict[str, float]:
+    scenarios = list(generate_scenarios(args.tasks, values_per_scenario=6, seed=args.seed))
+    results: Dict[str, float] = {}
+    for strategy_config in STRATEGIES:
+        strategy = STRATEGY_REGISTRY[strategy_config.name](**strategy_config.parameters)
+        seconds = timed(lambda: sum(1 for _ in build_prompts_many(strategy, scenarios, None)), args.repeat)
+        results[f"{strategy_config.name}_per_second"] = len(scenarios) / seconds
+    return results
+
+
+def bench_dataset(args: argparse.Namespace) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_scenarios_jsonl(Path(directory) / "bank.jsonl", args.dataset_size, seed=args.seed)
+        load_seconds = timed(lambda: ScenarioDataset.from_file(path), args.repeat)
+        stream_seconds = timed(lambda: sum(1 for _ in ScenarioDataset.stream(path)), args.repeat)
+    return {
+        "load_seconds": load_seconds,
+        "stream_seconds": stream_seconds,
+        "scenarios_per_second": args.dataset_size / load_seconds,
+    }
+
+
+BENCHMARKS: Dict[str, Callable[[argparse.Namespace], Dict[str, float]]] = {
+    "runner": bench_runner,
+    "scheduler": bench_scheduler,
+    "scoring": bench_scoring,
+    "prompts": bench_prompts,
+    "dataset": bench_dataset,
+}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: Dict[str, Dict[str, float]], previous: Dict[str, Dict[str, float]]) -> List[str]:
+    lines = []
+    for name, metrics in current.items():
+        for metric, value in metrics.items():
+            before = previous.get(name, {}).get(metric)
+            if before:
+                lines.append(f"{name}.{metric}: {before:.4g} -> {value:.4g} ({(value / before - 1) * 100:+.1f}%)")
+    return lines
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="Benchmarks to run (default: all)")
+    parser.add_argument("--scenarios", type=int, default=200, help="Scenarios in the end-to-end runner benchmark")
+    parser.add_argument("--parallelism", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.02, help="Median simulated call latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of simulated calls that fail")
+    parser.add_argument("--tasks", type=int, default=20000, help="Items in scheduler, scoring and prompt benchmarks")
+    parser.add_argument("--dataset-size", type=int, default=20000, help="Scenarios in the dataset load benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per benchmark (best time is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results.json"))
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare against")
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    selected = args.only or list(BENCHMARKS)
+    results = {name: BENCHMARKS[name](args) for name in selected}
+    for name, metrics in results.items():
+        print(name, ", ".join(f"{metric}={value:.4g}" for metric, value in metrics.items()))
+    if args.compare is not None:
+        previous = json.loads(args.compare.read_text())["results"]
+        print("\n".join(compare(results, previous)))
+    payload = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "parameters": {key: value for key, value in vars(args).items() if key not in {"output", "compare", "only"}},
+        "results": results,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(payload, indent=2))
+    print(f"Wrote benchmark results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
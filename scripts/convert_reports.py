@@ -0,0 +1,31 @@
+"""Convert JSON or YAML reports into columnar report stores."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from pref_gap_experiments.columnar import write_columnar
+from pref_gap_experiments.sharding import load_reports
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("reports", nargs="+", type=Path, help="JSON or YAML reports to convert")
+    parser.add_argument(
+        "--output-dir", type=Path, help="Directory for the stores (default: next to each input, suffixed '.cols')"
+    )
+    return parser
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    for source in args.reports:
+        name = source.with_suffix(".cols").name
+        target = args.output_dir / name if args.output_dir is not None else source.with_suffix(".cols")
+        write_columnar(target, load_reports(source))
+        print(f"Converted {source} -> {target}")
+
+
+if __name__ == "__main__":
+    main()
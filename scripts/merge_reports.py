@@ -0,0 +1,53 @@
+"""Merge per-shard reports written by ``run_experiments.py --shard i/n``."""
+
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+from typing import Dict
+
+from pref_gap_experiments import AlignmentReport
+from pref_gap_experiments.cli import write_reports
+from pref_gap_experiments.sharding import load_reports, merge_shard_reports
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "reports",
+        nargs="+",
+        help="Shard reports as INDEX=PATH (e.g. 0=reports.0.yaml), or plain paths listed in shard order",
+    )
+    parser.add_argument("--output", type=Path, default=Path("reports.yaml"), help="Where to write the merged report (JSON if it ends in .json)")
+    parser.add_argument("--format", choices=("yaml", "columnar"), default="yaml", help="Format of the merged report")
+    return parser
+
+
+def parse_inputs(entries: list[str]) -> Dict[int, Path]:
+    inputs: Dict[int, Path] = {}
+    for position, entry in enumerate(entries):
+        match = re.fullmatch(r"(\d+)=(.+)", entry)
+        index, path = (int(match.group(1)), match.group(2)) if match else (position, entry)
+        if index in inputs:
+            raise ValueError(f"Shard {index} given more than once")
+        inputs[index] = Path(path)
+    return inputs
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    try:
+        inputs = parse_inputs(args.reports)
+    except ValueError as exc:
+        parser.error(str(exc))
+    merged: Dict[str, AlignmentReport] = merge_shard_reports(
+        {index: load_reports(path) for index, path in inputs.items()}
+    )
+    write_reports(args.output, merged, args.format)
+    print(f"Merged {len(inputs)} shards into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,60 @@
-"""Experiment harness for studying stated vs revealed preference gaps in LLMs."""
-
-from .config import ExperimentConfig, Scenario, StrategyConfig
-from .datasets import ScenarioDataset
-from .evaluation import AlignmentReport, compute_alignment_gap
-from .experiments import ExperimentRunner
-from .llm import LLMClient, MockLLMClient
-from .strategies import (
-    BaselinePromptStrategy,
-    PromptStrategy,
-    RankedValuesPromptStrategy,
-    SafetyAppendPromptStrategy,
-)
-
-__all__ = [
-    "AlignmentReport",
-    "BaselinePromptStrategy",
-    "ExperimentConfig",
-    "ExperimentRunner",
-    "LLMClient",
-    "MockLLMClient",
-    "PromptStrategy",
-    "RankedValuesPromptStrategy",
-    "SafetyAppendPromptStrategy",
-    "Scenario",
-    "ScenarioDataset",
-    "StrategyConfig",
-    "compute_alignment_gap",
-]
+"""Experiment harness for studying stated vs revealed preference gaps in LLMs.
+
+Public names are resolved from their submodules on first access, so
+``import pref_gap_experiments`` stays cheap and tools that only need one
+module do not pay for the rest of the package.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .cache import CachingLLMClient, ResponseCache
+    from .config import ExperimentConfig, Scenario, StrategyConfig
+    from .datasets import ScenarioDataset, StreamingScenarioDataset
+    from .evaluation import AlignmentReport, CompactResults, compute_alignment_gap
+    from .experiments import ExperimentRunner
+    from .llm import LLMClient, MockLLMClient
+    from .strategies import (
+        BaselinePromptStrategy,
+        PromptStrategy,
+        RankedValuesPromptStrategy,
+        SafetyAppendPromptStrategy,
+    )
+
+_EXPORTS = {
+    "AlignmentReport": "evaluation",
+    "BaselinePromptStrategy": "strategies",
+    "CachingLLMClient": "cache",
+    "CompactResults": "evaluation",
+    "ExperimentConfig": "config",
+    "ExperimentRunner": "experiments",
+    "LLMClient": "llm",
+    "MockLLMClient": "llm",
+    "PromptStrategy": "strategies",
+    "RankedValuesPromptStrategy": "strategies",
+    "ResponseCache": "cache",
+    "SafetyAppendPromptStrategy": "strategies",
+    "Scenario": "config",
+    "ScenarioDataset": "datasets",
+    "StrategyConfig": "config",
+    "StreamingScenarioDataset": "datasets",
+    "compute_alignment_gap": "evaluation",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,23 @@
+"""Deferred imports of optional dependencies.
+
+Heavy optional packages (NumPy, PyYAML, the OpenAI SDK, local inference
+libraries) are imported the first time a code path needs them rather than
+when the package is imported, which keeps CLI startup fast.
+"""
+
+from __future__ import annotations
+
+import importlib
+from functools import lru_cache
+from types import ModuleType
+from typing import Optional
+
+
+@lru_cache(maxsize=None)
+def optional_module(name: str) -> Optional[ModuleType]:
+    """Import ``name`` on first use, returning ``None`` if it is not installed."""
+
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
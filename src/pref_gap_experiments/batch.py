@@ -0,0 +1,234 @@
+"""Batch-mode LLM client for offline bulk evaluation.
+
+``BatchLLMClient`` collects the ``generate`` calls issued by the runner,
+writes them to a JSONL file in the OpenAI batch input format, submits the
+file through a ``BatchBackend``, polls until it finishes and resolves each
+pending call with its matching output line. Because calls only resolve once
+their batch completes, runs should use a ``parallelism`` at least as large as
+``max_batch_size`` so batches can fill up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Protocol, Set, Tuple
+
+from ._optional import optional_module
+from .llm import LLMClient
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+
+class BatchRequestError(RuntimeError):
+    """Raised for a request that the batch backend failed to answer."""
+
+
+class BatchBackend(Protocol):
+    """Provider-side batch API."""
+
+    async def submit(self, requests_path: Path) -> str:
+        """Upload a JSONL request file and start a batch, returning its id."""
+
+    async def poll(self, batch_id: str) -> str:
+        """Return the batch status (e.g. ``in_progress`` or ``completed``)."""
+
+    async def fetch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Return the output lines of a finished batch."""
+
+
+def build_batch_line(custom_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    return {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+
+def extract_content(line: Dict[str, Any]) -> str:
+    """Return the completion text of a batch output line or raise ``BatchRequestError``."""
+
+    response = line.get("response") or {}
+    if line.get("error") or response.get("status_code", 200) >= 400:
+        raise BatchRequestError(f"Batch request {line.get('custom_id')} failed: {line.get('error') or response}")
+    return response["body"]["choices"][0]["message"]["content"] or ""
+
+
+class BatchLLMClient(LLMClient):
+    """Accumulates generation requests into provider batch jobs."""
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        model: str,
+        *,
+        batch_dir: Path | str | None = None,
+        max_batch_size: int = 1000,
+        flush_interval: float = 0.5,
+        poll_interval: float = 30.0,
+    ) -> None:
+        self.backend = backend
+        self.model = model
+        self.batch_dir = Path(batch_dir) if batch_dir is not None else Path(tempfile.mkdtemp(prefix="pref-gap-batch-"))
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self.batches_submitted = 0
+        self._pending: List[Tuple[str, Dict[str, Any], asyncio.Future[str]]] = []
+        self._counter = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task[None]] = set()
+
+    async def generate(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> str:
+        body: Dict[str, Any] = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": temperature,
+        }
+        if max_tokens is not None:
+            body["max_tokens"] = max_tokens
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[str] = loop.create_future()
+        self._counter += 1
+        self._pending.append((f"request-{self._counter}", body, future))
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self.flush)
+        return await future
+
+    def flush(self) -> None:
+        """Submit everything accumulated so far as one batch."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        requests, self._pending = self._pending, []
+        task = asyncio.get_running_loop().create_task(self._run_batch(requests))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, requests: List[Tuple[str, Dict[str, Any], asyncio.Future[str]]]) -> None:
+        futures = {custom_id: future for custom_id, _, future in requests}
+        try:
+            self.batches_submitted += 1
+            self.batch_dir.mkdir(parents=True, exist_ok=True)
+            path = self.batch_dir / f"batch-{self.batches_submitted:05d}.jsonl"
+            with path.open("w", encoding="utf-8") as handle:
+                for custom_id, body, _ in requests:
+                    handle.write(json.dumps(build_batch_line(custom_id, body), ensure_ascii=False) + "\n")
+            batch_id = await self.backend.submit(path)
+            status = await self.backend.poll(batch_id)
+            while status not in TERMINAL_STATUSES:
+                await asyncio.sleep(self.poll_interval)
+                status = await self.backend.poll(batch_id)
+            if status in {"failed", "cancelled"}:
+                raise BatchRequestError(f"Batch {batch_id} ended with status '{status}'")
+            for line in await self.backend.fetch_results(batch_id):
+                future = futures.pop(line.get("custom_id"), None)
+                if future is None or future.done():
+                    continue
+                try:
+                    future.set_result(extract_content(line))
+                except BatchRequestError as exc:
+                    future.set_exception(exc)
+            for custom_id, future in futures.items():
+                if not future.done():
+                    future.set_exception(BatchRequestError(f"Batch {batch_id} returned no result for {custom_id}"))
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as exc:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(exc)
+
+
+@dataclass
+class LocalBatchServer:
+    """In-process stand-in for a provider batch API.
+
+    Requests are answered by ``client`` once the batch has been polled
+    ``polls_until_complete`` times, which lets tests exercise the polling path.
+    """
+
+    client: LLMClient
+    polls_until_complete: int = 1
+    submitted: List[List[Dict[str, Any]]] = field(default_factory=list)
+    _polls: Dict[str, int] = field(default_factory=dict, repr=False)
+
+    async def submit(self, requests_path: Path) -> str:
+        lines = [json.loads(line) for line in requests_path.read_text(encoding="utf-8").splitlines() if line.strip()]
+        self.submitted.append(lines)
+        batch_id = f"batch-{len(self.submitted)}"
+        self._polls[batch_id] = 0
+        return batch_id
+
+    async def poll(self, batch_id: str) -> str:
+        self._polls[batch_id] += 1
+        return "completed" if self._polls[batch_id] > self.polls_until_complete else "in_progress"
+
+    async def fetch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        requests = self.submitted[int(batch_id.rsplit("-", 1)[1]) - 1]
+        results = []
+        for line in requests:
+            body = line["body"]
+            content = await self.client.generate(
+                system=body["messages"][0]["content"],
+                prompt=body["messages"][1]["content"],
+                temperature=body["temperature"],
+                max_tokens=body.get("max_tokens"),
+            )
+            results.append(
+                {
+                    "custom_id": line["custom_id"],
+                    "response": {"status_code": 200, "body": {"choices": [{"message": {"content": content}}]}},
+                    "error": None,
+                }
+            )
+        return results
+
+
+class OpenAIBatchBackend:  # pragma: no cover - requires external service
+    """Submits batches through the OpenAI Batch API."""
+
+    def __init__(self, client: Any | None = None, completion_window: str = "24h") -> None:
+        if client is None:
+            openai = optional_module("openai")
+            if openai is None:
+                raise RuntimeError("openai package is not available")
+            client = openai.AsyncOpenAI()
+        self._client = client
+        self.completion_window = completion_window
+        self._batches: Dict[str, Any] = {}
+
+    async def submit(self, requests_path: Path) -> str:
+        with requests_path.open("rb") as handle:
+            uploaded = await self._client.files.create(file=handle, purpose="batch")
+        batch = await self._client.batches.create(
+            input_file_id=uploaded.id, endpoint=BATCH_ENDPOINT, completion_window=self.completion_window
+        )
+        return batch.id
+
+    async def poll(self, batch_id: str) -> str:
+        batch = await self._client.batches.retrieve(batch_id)
+        self._batches[batch_id] = batch
+        return batch.status
+
+    async def fetch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        batch = self._batches[batch_id]
+        lines: List[Dict[str, Any]] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self._client.files.content(file_id)
+            lines.extend(json.loads(line) for line in content.text.splitlines() if line.strip())
+        return lines
@@ -0,0 +1,193 @@
+"""Content-addressed response caching for LLM clients."""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+from .coalescing import request_key
+from .llm import LLMClient
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache effectiveness."""
+
+    hits: int = 0
+    misses: int = 0
+    memory_hits: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        if total == 0:
+            return 0.0
+        return self.hits / total
+
+
+class ResponseCache:
+    """SQLite-backed response store with an in-memory LRU front.
+
+    Entries older than ``max_age`` seconds are treated as misses and pruned.
+    When ``max_entries`` is set, the least recently read rows on disk are
+    evicted once the store grows past it; the row count is read once on open
+    and kept up to date by this instance, so rows written by other processes
+    are only counted after a reopen. Reads served from the memory front do not
+    refresh the on-disk access time. File-backed caches use SQLite's WAL
+    journal, and writers wait up to ``busy_timeout`` seconds for a lock, so
+    several processes (e.g. ``--processes`` workers) can share one file.
+    """
+
+    def __init__(
+        self,
+        path: Path | str = ":memory:",
+        *,
+        memory_entries: int = 1024,
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+        busy_timeout: float = 30.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = str(path)
+        self.memory_entries = memory_entries
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.stats = CacheStats()
+        self._clock = clock
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=busy_timeout)
+        if self.path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed)")
+        self._db.commit()
+        self._rows = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Optional[str]:
+        now = self._clock()
+        cached = self._memory.get(key)
+        if cached is not None and not self._expired(cached[1], now):
+            self._memory.move_to_end(key)
+            self.stats.hits += 1
+            self.stats.memory_hits += 1
+            return cached[0]
+        row = self._db.execute("SELECT response, created FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None or self._expired(row[1], now):
+            if row is not None:
+                self._discard(key)
+            self.stats.misses += 1
+            return None
+        self._db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        self._db.commit()
+        self._remember(key, row[0], row[1])
+        self.stats.hits += 1
+        return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        now = self._clock()
+        inserted = self._db.execute(
+            "INSERT OR IGNORE INTO responses (key, response, created, accessed) VALUES (?, ?, ?, ?)",
+            (key, response, now, now),
+        ).rowcount
+        if inserted:
+            self._rows += 1
+        else:
+            self._db.execute(
+                "UPDATE responses SET response = ?, created = ?, accessed = ? WHERE key = ?",
+                (response, now, now, key),
+            )
+        self._db.commit()
+        self._remember(key, response, now)
+        self.evict()
+
+    def evict(self) -> int:
+        """Apply age and size limits, returning the number of rows removed."""
+
+        removed = 0
+        if self.max_age is not None:
+            cutoff = self._clock() - self.max_age
+            expired = self._db.execute("DELETE FROM responses WHERE created < ?", (cutoff,)).rowcount
+            self._rows -= expired
+            removed += expired
+            for key in [key for key, (_, created) in self._memory.items() if created < cutoff]:
+                del self._memory[key]
+        if self.max_entries is not None:
+            overflow = self._rows - self.max_entries
+            if overflow > 0:
+                stale = self._db.execute(
+                    "SELECT key FROM responses ORDER BY accessed ASC LIMIT ?", (overflow,)
+                ).fetchall()
+                for (key,) in stale:
+                    self._discard(key)
+                removed += len(stale)
+        self._db.commit()
+        self.stats.evictions += removed
+        return removed
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.max_age is not None and now - created > self.max_age
+
+    def _remember(self, key: str, response: str, created: float) -> None:
+        if self.memory_entries <= 0:
+            return
+        self._memory[key] = (response, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _discard(self, key: str) -> None:
+        self._memory.pop(key, None)
+        self._rows -= self._db.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount
+
+
+class CachingLLMClient(LLMClient):
+    """Wraps another client and serves repeated requests from a ``ResponseCache``.
+
+    Only deterministic (temperature 0) requests are cached: at higher
+    temperatures repeated requests are independent samples and always reach
+    the wrapped client.
+    """
+
+    def __init__(self, client: LLMClient, cache: ResponseCache | None = None) -> None:
+        self.client = client
+        self.model = client.model
+        self.cache = cache if cache is not None else ResponseCache()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.cache.stats
+
+    async def generate(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> str:
+        if temperature > 0:
+            return await self.client.generate(
+                system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens
+            )
+        key = request_key(
+            model=self.model, system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self.client.generate(
+            system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens
+        )
+        self.cache.put(key, response)
+        return response
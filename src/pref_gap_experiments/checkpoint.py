@@ -0,0 +1,71 @@
+"""Append-only checkpoint journal for resumable experiment runs."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Set, TextIO, Tuple
+
+from .evaluation import AlignmentResult
+
+CheckpointKey = Tuple[str, str]
+
+
+class CheckpointJournal:
+    """Records completed (strategy, scenario_id) units as JSON lines.
+
+    Each record is flushed as soon as it is written, so a run that dies part
+    way through leaves a journal of every unit that finished. A torn final line
+    from an interrupted write is ignored when the journal is loaded. Only
+    results loaded for a resume are held in memory; units written during the
+    run are remembered by key alone.
+    """
+
+    def __init__(self, path: Path | str, *, resume: bool = True, fsync: bool = False) -> None:
+        self.path = Path(path)
+        self.fsync = fsync
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._completed: Dict[CheckpointKey, AlignmentResult] = self._load() if resume else {}
+        self._written: Set[CheckpointKey] = set()
+        self._handle: TextIO = self.path.open("a" if resume else "w", encoding="utf-8")
+        if resume and self._handle.tell() > 0 and not self._ends_with_newline():
+            # Terminate a torn record so the next append starts on a fresh line.
+            self._handle.write("\n")
+
+    def completed(self) -> Dict[CheckpointKey, AlignmentResult]:
+        """Return the results loaded from the journal on resume, keyed by (strategy, scenario_id)."""
+
+        return dict(self._completed)
+
+    def write(self, strategy: str, index: int, result: AlignmentResult) -> None:
+        record = {"strategy": strategy, "scenario_id": result.scenario_id, "result": result.to_dict()}
+        self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._handle.flush()
+        if self.fsync:
+            os.fsync(self._handle.fileno())
+        self._written.add((strategy, result.scenario_id))
+
+    def __contains__(self, key: CheckpointKey) -> bool:
+        return key in self._completed or key in self._written
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def _ends_with_newline(self) -> bool:
+        with self.path.open("rb") as handle:
+            handle.seek(-1, os.SEEK_END)
+            return handle.read(1) == b"\n"
+
+    def _load(self) -> Dict[CheckpointKey, AlignmentResult]:
+        completed: Dict[CheckpointKey, AlignmentResult] = {}
+        if not self.path.exists():
+            return completed
+        with self.path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                completed[(record["strategy"], record["scenario_id"])] = AlignmentResult(**record["result"])
+        return completed
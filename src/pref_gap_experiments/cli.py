@@ -0,0 +1,468 @@
+"""Command-line interface for running preference gap experiments.
+
+Installed as the ``pref-gap-run`` console script; ``scripts/run_experiments.py``
+is a thin wrapper around ``main``. Modules for optional features (batch,
+local, replay and multi-model clients, the SQLite response cache, columnar
+output, incremental runs) are imported only when the corresponding flags are
+used, and PyYAML only for YAML configs and reports, so short invocations start
+quickly.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import functools
+import json
+from dataclasses import replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Tuple
+
+from ._optional import optional_module
+from .checkpoint import CheckpointJournal
+from .config import ExperimentConfig, ModelEndpoint, Scenario, StrategyConfig
+from .datasets import ScenarioDataset, parse_shard
+from .evaluation import AlignmentReport
+from .experiments import ExperimentRunner
+from .llm import LLMClient, MockLLMClient, OpenAIClient
+from .sinks import JSONLResultSink
+from .telemetry import Telemetry
+
+if TYPE_CHECKING:
+    from .local import LocalBackend
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pref-gap-run", description="Run preference gap experiments.")
+    parser.add_argument("dataset", type=Path, help="Path to dataset JSON, JSONL or YAML file")
+    parser.add_argument("config", type=Path, help="Path to experiment configuration YAML or JSON file")
+    parser.add_argument("--shard", default="0/1", help="Only run scenarios in shard i of n, given as 'i/n'")
+    parser.add_argument(
+        "--only", action="append", metavar="ID", help="Only run the scenario with this identifier (repeatable)"
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=1,
+        help="Split the dataset into this many shards run in local worker processes, dividing the budgets between them",
+    )
+    parser.add_argument("--use-openai", action="store_true", help="Use the OpenAI API client")
+    parser.add_argument("--requests-per-minute", type=float, help="Client-side request budget for the OpenAI client")
+    parser.add_argument("--tokens-per-minute", type=float, help="Client-side token budget for the OpenAI client")
+    parser.add_argument("--max-attempts", type=int, default=6, help="Attempts per request before giving up on errors")
+    parser.add_argument(
+        "--adaptive-concurrency",
+        action="store_true",
+        help="Shrink and grow in-flight OpenAI calls based on observed throttling (capped by parallelism)",
+    )
+    parser.add_argument("--mock-responses", type=Path, help="JSON file of scripted responses for the mock client")
+    parser.add_argument("--record", type=Path, metavar="DIR", help="Archive every LLM exchange to this directory")
+    parser.add_argument("--replay", type=Path, metavar="DIR", help="Serve responses from an archive written by --record")
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        nargs="?",
+        const=1.0,
+        metavar="SCALE",
+        help="With --replay, wait for the recorded latencies (optionally scaled)",
+    )
+    parser.add_argument("--replay-model", help="Model name the replayed archive was recorded with (default: llm_model)")
+    parser.add_argument("--local-model", help="Run a local model (Hugging Face id/path or GGUF file) instead of an API")
+    parser.add_argument(
+        "--local-backend",
+        choices=("transformers", "llama-cpp"),
+        default="transformers",
+        help="Inference library for --local-model",
+    )
+    parser.add_argument("--local-batch-size", type=int, default=8, help="Concurrent calls merged into one local batch")
+    parser.add_argument("--local-threads", type=int, help="CPU threads used by the local backend")
+    parser.add_argument("--batch", action="store_true", help="Submit requests through the provider batch API")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Maximum requests per submitted batch")
+    parser.add_argument("--batch-dir", type=Path, help="Directory for batch request files")
+    parser.add_argument("--batch-poll-interval", type=float, default=30.0, help="Seconds between batch status polls")
+    parser.add_argument("--output", type=Path, default=Path("reports.yaml"), help="Where to write the report")
+    parser.add_argument(
+        "--format",
+        choices=("yaml", "columnar"),
+        default="yaml",
+        help="Report format: one YAML document (JSON if --output ends in .json), or a columnar store directory",
+    )
+    parser.add_argument("--stream-results", type=Path, help="Append each result to this JSONL file as it completes")
+    parser.add_argument("--checkpoint", type=Path, help="Journal completed units to this JSONL file as they finish")
+    parser.add_argument(
+        "--resume", action="store_true", help="Skip units already recorded in --checkpoint instead of starting over"
+    )
+    parser.add_argument(
+        "--incremental",
+        type=Path,
+        metavar="MANIFEST",
+        help="Reuse unchanged results from the existing --output report, tracked by this manifest file",
+    )
+    parser.add_argument("--telemetry", action="store_true", help="Print latency percentiles and throughput after the run")
+    parser.add_argument("--trace", type=Path, help="Write a Chrome trace JSON of every instrumented span to this path")
+    parser.add_argument("--cache", type=Path, help="SQLite file used to cache LLM responses across runs")
+    parser.add_argument("--cache-max-entries", type=int, help="Evict least recently used cache rows beyond this count")
+    parser.add_argument("--cache-max-age", type=float, help="Treat cached responses older than this many seconds as stale")
+    return parser
+
+
+def read_structured(path: Path) -> Any:
+    """Parse a JSON file directly; anything else is read as YAML (which PyYAML must provide)."""
+
+    text = path.read_text()
+    if path.suffix == ".json":
+        return json.loads(text)
+    yaml = optional_module("yaml")
+    if yaml is None:
+        raise RuntimeError(f"PyYAML is required to read {path}")
+    return yaml.safe_load(text)
+
+
+def load_config(path: Path, scenarios: Iterable[Scenario]) -> ExperimentConfig:
+    raw = read_structured(path)
+    strategies = [StrategyConfig(**entry) for entry in raw["strategies"]]
+    models = [
+        ModelEndpoint(model=entry) if isinstance(entry, str) else ModelEndpoint(**entry)
+        for entry in raw.get("models", [])
+    ]
+    return ExperimentConfig(
+        scenarios=scenarios,
+        strategies=strategies,
+        llm_model=raw["llm_model"] if "llm_model" in raw or not models else models[0].model,
+        temperature=raw.get("temperature", 0.0),
+        max_tokens=raw.get("max_tokens"),
+        parallelism=raw.get("parallelism", 4),
+        system_values=raw.get("system_values"),
+        concurrent_queries=raw.get("concurrent_queries", True),
+        deduplicate_requests=raw.get("deduplicate_requests", True),
+        samples_per_scenario=raw.get("samples_per_scenario", 1),
+        min_samples=raw.get("min_samples", 3),
+        target_ci_half_width=raw.get("target_ci_half_width"),
+        confidence=raw.get("confidence", 0.95),
+        prefix_window=raw.get("prefix_window", 256),
+        stream_responses=raw.get("stream_responses", False),
+        early_termination=raw.get("early_termination", True),
+        compact_results=raw.get("compact_results", False),
+        spill_dir=raw.get("spill_dir"),
+        models=models,
+    )
+
+
+def select_client(
+    config: ExperimentConfig, use_openai: bool, args: argparse.Namespace | None = None
+) -> LLMClient:
+    if args is not None and args.local_model:
+        from .local import LlamaCppBackend, LocalLLMClient, TransformersBackend
+
+        if args.local_backend == "llama-cpp":
+            backend: LocalBackend = LlamaCppBackend(args.local_model, threads=args.local_threads)
+        else:
+            backend = TransformersBackend(args.local_model, threads=args.local_threads)
+        return LocalLLMClient(backend, max_batch_size=args.local_batch_size)
+    if use_openai:
+        if args is None:
+            return OpenAIClient(model=config.llm_model)
+        rate_limiter = None
+        from .ratelimit import AIMDController, RateLimiter, RetryPolicy
+
+        if args.requests_per_minute or args.tokens_per_minute:
+            rate_limiter = RateLimiter(args.requests_per_minute, args.tokens_per_minute)
+        concurrency = None
+        if args.adaptive_concurrency:
+            concurrency = AIMDController(initial=config.parallelism, maximum=config.parallelism)
+        return OpenAIClient(
+            model=config.llm_model,
+            rate_limiter=rate_limiter,
+            retry_policy=RetryPolicy(max_attempts=args.max_attempts),
+            concurrency=concurrency,
+        )
+    return MockLLMClient(model="mock", scripted_responses=mock_responses(args))
+
+
+def mock_responses(args: argparse.Namespace | None) -> Dict[str, str]:
+    if args is None or args.mock_responses is None:
+        return {}
+    return json.loads(args.mock_responses.read_text())["responses"]
+
+
+def build_client(config: ExperimentConfig, args: argparse.Namespace) -> LLMClient:
+    inner: LLMClient | None
+    if args.replay is not None or args.record is not None:
+        from .replay import RecordingLLMClient, ReplayLLMClient, TrafficArchive
+    if args.replay is not None:
+        inner = ReplayLLMClient(
+            TrafficArchive(args.replay),
+            args.replay_model or config.llm_model,
+            reproduce_latency=args.replay_latency is not None,
+            latency_scale=args.replay_latency or 1.0,
+        )
+    elif args.batch and args.use_openai:
+        # The provider runs the batch, so no per-request API client is needed.
+        inner = None
+    else:
+        inner = select_client(config, args.use_openai, args)
+    client: LLMClient
+    if args.batch:
+        from .batch import BatchLLMClient, LocalBatchServer, OpenAIBatchBackend
+
+        backend = OpenAIBatchBackend() if inner is None else LocalBatchServer(inner, polls_until_complete=0)
+        client = BatchLLMClient(
+            backend,
+            config.llm_model if inner is None else inner.model,
+            batch_dir=args.batch_dir,
+            max_batch_size=args.batch_size,
+            poll_interval=args.batch_poll_interval,
+        )
+    else:
+        assert inner is not None
+        client = inner
+    if args.record is not None:
+        # Recorded outside the batch layer so batch API responses are archived too.
+        client = RecordingLLMClient(client, TrafficArchive(args.record))
+    if args.cache is not None:
+        from .cache import CachingLLMClient, ResponseCache
+
+        cache = ResponseCache(args.cache, max_entries=args.cache_max_entries, max_age=args.cache_max_age)
+        client = CachingLLMClient(client, cache)
+    return client
+
+
+def build_clients(config: ExperimentConfig, args: argparse.Namespace) -> Dict[str, LLMClient]:
+    """One client per endpoint of a multi-model config, keyed by endpoint label.
+
+    Endpoints share the traffic archive and response cache (both key
+    requests by model) but nothing that would couple their throughput.
+    """
+
+    archive = None
+    if args.replay is not None or args.record is not None:
+        from .replay import RecordingLLMClient, ReplayLLMClient, TrafficArchive
+
+        archive = TrafficArchive(args.replay if args.replay is not None else args.record)
+    cache = None
+    if args.cache is not None:
+        from .cache import CachingLLMClient, ResponseCache
+
+        cache = ResponseCache(args.cache, max_entries=args.cache_max_entries, max_age=args.cache_max_age)
+    from .ratelimit import RetryPolicy
+
+    responses = mock_responses(args)
+    clients: Dict[str, LLMClient] = {}
+    for endpoint in config.models:
+        client: LLMClient
+        if args.replay is not None:
+            client = ReplayLLMClient(
+                archive,
+                endpoint.model,
+                reproduce_latency=args.replay_latency is not None,
+                latency_scale=args.replay_latency or 1.0,
+            )
+        elif args.use_openai:
+            from .fanout import openai_endpoint_client
+
+            # Command-line budgets apply to each endpoint that does not set its own.
+            endpoint = replace(
+                endpoint,
+                requests_per_minute=endpoint.requests_per_minute or args.requests_per_minute,
+                tokens_per_minute=endpoint.tokens_per_minute or args.tokens_per_minute,
+            )
+            client = openai_endpoint_client(
+                endpoint,
+                config.parallelism,
+                retry_policy=RetryPolicy(max_attempts=args.max_attempts),
+                adaptive_concurrency=args.adaptive_concurrency,
+            )
+        else:
+            client = MockLLMClient(model=endpoint.model, scripted_responses=responses)
+        if args.record is not None:
+            client = RecordingLLMClient(client, archive)
+        if cache is not None:
+            client = CachingLLMClient(client, cache)
+        clients[endpoint.label] = client
+    return clients
+
+
+def run_models(config: ExperimentConfig, args: argparse.Namespace) -> None:
+    """Run a multi-model config and write reports named ``<label>/<strategy>``."""
+
+    from .fanout import MultiModelRunner, report_name
+
+    sink = JSONLResultSink(args.stream_results) if args.stream_results is not None else None
+    telemetry = Telemetry() if args.telemetry or args.trace else None
+    clients = build_clients(config, args)
+    runner = MultiModelRunner(config=config, clients=clients, sink=sink, telemetry=telemetry)
+    try:
+        reports = asyncio.run(runner.run())
+    finally:
+        if sink is not None:
+            sink.close()
+    for label, endpoint_runner in runner.runners.items():
+        completed = sum(len(report.results) for (name, _), report in reports.items() if name == label)
+        status = f"failed: {runner.failures[label]!r}" if label in runner.failures else f"{completed} results"
+        print(f"{label} ({endpoint_runner.config.llm_model}, parallelism {endpoint_runner.config.parallelism}): {status}")
+    if telemetry is not None:
+        print(telemetry.format_summary())
+        if args.trace is not None:
+            telemetry.write_chrome_trace(args.trace)
+            print(f"Wrote trace to {args.trace}")
+    if args.cache is not None:
+        from .cache import CachingLLMClient
+
+        cached = [client for client in clients.values() if isinstance(client, CachingLLMClient)]
+        hits = sum(client.stats.hits for client in cached)
+        misses = sum(client.stats.misses for client in cached)
+        print(f"Cache: {hits} hits, {misses} misses")
+        # Every endpoint wraps the same ResponseCache.
+        cached[0].cache.close()
+    flattened = {report_name(label, strategy): report for (label, strategy), report in reports.items()}
+    write_reports(args.output, flattened, args.format)
+    if runner.failures:
+        raise SystemExit(f"{len(runner.failures)} of {len(runner.runners)} model endpoints failed")
+
+
+def split_budgets(
+    config: ExperimentConfig, args: argparse.Namespace, workers: int
+) -> Tuple[ExperimentConfig, argparse.Namespace]:
+    """Divide the run's parallelism and request/token budgets evenly between ``workers`` processes.
+
+    Each worker builds its own client, rate limiter and concurrency
+    controller, so without this ``--processes N`` would run N times the
+    configured budgets against the same account.
+    """
+
+    config = replace(config, parallelism=max(1, config.parallelism // workers))
+    args = argparse.Namespace(**vars(args))
+    for name in ("requests_per_minute", "tokens_per_minute"):
+        if getattr(args, name):
+            setattr(args, name, getattr(args, name) / workers)
+    return config, args
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.resume and args.checkpoint is None:
+        parser.error("--resume requires --checkpoint")
+    if args.local_model and args.use_openai:
+        parser.error("--local-model cannot be combined with --use-openai")
+    if args.replay is not None and (args.use_openai or args.local_model or args.record is not None):
+        parser.error("--replay cannot be combined with --use-openai, --local-model or --record")
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as exc:
+        parser.error(str(exc))
+    scenarios = ScenarioDataset.stream(args.dataset, shard=shard, include=args.only)
+    config = load_config(args.config, scenarios)
+    if config.models:
+        unsupported = {
+            "--processes": args.processes > 1,
+            "--checkpoint": args.checkpoint is not None,
+            "--incremental": args.incremental is not None,
+            "--batch": args.batch,
+            "--local-model": args.local_model,
+            "--replay-model": args.replay_model,
+        }
+        used = [flag for flag, value in unsupported.items() if value]
+        if used:
+            parser.error(f"a config with 'models' cannot be combined with {', '.join(used)}")
+        run_models(config, args)
+        return
+    if args.processes > 1:
+        config, args = split_budgets(config, args, args.processes)
+    if args.batch:
+        # Calls only resolve when their batch finishes, so let enough units be in flight to fill a batch.
+        config.parallelism = max(config.parallelism, args.batch_size)
+    if args.local_model:
+        # Each unit issues two concurrent calls; keep enough in flight to fill a micro-batch.
+        config.parallelism = max(config.parallelism, args.local_batch_size)
+    if args.processes > 1:
+        if args.checkpoint or args.stream_results or args.incremental or args.record or args.only or shard != (0, 1):
+            parser.error(
+                "--processes cannot be combined with --checkpoint, --stream-results, --incremental, --record, "
+                "--only or --shard"
+            )
+        from .sharding import run_sharded
+
+        factory = functools.partial(build_client, replace(config, scenarios=[]), args)
+        reports = run_sharded(args.dataset, config, factory, args.processes)
+        write_reports(args.output, reports, args.format)
+        return
+    client = build_client(config, args)
+    sink = JSONLResultSink(args.stream_results) if args.stream_results is not None else None
+    checkpoint = CheckpointJournal(args.checkpoint, resume=args.resume) if args.checkpoint is not None else None
+    telemetry = Telemetry() if args.telemetry or args.trace else None
+    incremental = None
+    if args.incremental is not None:
+        from .manifest import IncrementalRun
+        from .sharding import load_reports
+
+        previous = load_reports(args.output) if args.incremental.exists() and args.output.exists() else {}
+        incremental = IncrementalRun.load(args.incremental, previous)
+    runner = ExperimentRunner(
+        config=config, client=client, sink=sink, checkpoint=checkpoint, telemetry=telemetry, incremental=incremental
+    )
+    try:
+        reports = asyncio.run(runner.run())
+    finally:
+        if sink is not None:
+            sink.close()
+        if checkpoint is not None:
+            checkpoint.close()
+    if runner.coalescer is not None and runner.coalescer.coalesced + runner.coalescer.reused:
+        print(f"Deduplicated {runner.coalescer.coalesced + runner.coalescer.reused} identical requests")
+    if config.stream_responses and runner.early_stops:
+        print(f"Stopped {runner.early_stops} responses early")
+    if incremental is not None:
+        print(
+            f"Incremental: {incremental.reused} reused, {incremental.rescored} rescored, "
+            f"{incremental.regenerated} regenerated"
+        )
+    if telemetry is not None:
+        print(telemetry.format_summary())
+        if args.trace is not None:
+            telemetry.write_chrome_trace(args.trace)
+            print(f"Wrote trace to {args.trace}")
+    if args.cache is not None:
+        from .cache import CachingLLMClient
+
+        assert isinstance(client, CachingLLMClient)
+        stats = client.stats
+        print(f"Cache: {stats.hits} hits, {stats.misses} misses, {stats.evictions} evictions")
+        client.cache.close()
+    for name, report in reports.items():
+        usage = report.token_usage()
+        if usage is not None:
+            print(
+                f"{name}: {int(usage['prompt_tokens'])} prompt tokens, "
+                f"{int(usage['cached_tokens'])} cached ({usage['cached_fraction']:.0%})"
+            )
+    if args.local_model:
+        from .local import LocalLLMClient
+
+        assert isinstance(client, LocalLLMClient)
+        print(f"Local inference: {client.batches} batches, mean size {client.mean_batch_size:.1f}")
+        client.close()
+    write_reports(args.output, reports, args.format)
+    if incremental is not None:
+        # Saved after the report so the manifest never describes results that were not written.
+        incremental.current.save(args.incremental)
+
+
+def write_reports(path: Path, reports: Dict[str, AlignmentReport], fmt: str = "yaml") -> None:
+    if fmt == "columnar":
+        from .columnar import write_columnar
+
+        write_columnar(path, reports)
+        print(f"Wrote columnar reports to {path}")
+        return
+    serialized: Dict[str, Dict[str, object]] = {name: report.to_dict() for name, report in reports.items()}
+    yaml = optional_module("yaml") if path.suffix != ".json" else None
+    if yaml is not None:
+        path.write_text(yaml.safe_dump(serialized))
+    else:
+        path.write_text(json.dumps(serialized, indent=2, ensure_ascii=False) + "\n")
+    print(f"Wrote reports to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Request identity and in-run deduplication of identical LLM requests.
+
+Kept apart from ``cache`` so the runner can coalesce requests without
+loading the SQLite response cache.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+def request_key(
+    *,
+    model: str,
+    system: str,
+    prompt: str,
+    temperature: float,
+    max_tokens: Optional[int],
+    extra: Any = None,
+) -> str:
+    """Return a stable hash identifying a generation request.
+
+    ``extra`` distinguishes requests whose output also depends on something
+    besides the prompt (e.g. early-termination criteria); it is left out of
+    the hash when ``None`` so existing keys are unchanged.
+    """
+
+    fields: Dict[str, Any] = {
+        "model": model,
+        "system": system,
+        "prompt": prompt,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+    }
+    if extra is not None:
+        fields["extra"] = extra
+    payload = json.dumps(fields, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+
+class RequestCoalescer:
+    """Single-flight deduplication of identical requests within one run.
+
+    The first caller for a key performs the request; concurrent callers with
+    the same key await that same result instead of issuing their own, and
+    later callers reuse the finished response while it is among the
+    ``recent_entries`` most recently used ones (requests are grouped by
+    prompt, so duplicates tend to arrive close together; reuse across runs
+    is the job of ``ResponseCache``). Failures are not remembered, so a later
+    caller retries the request.
+    """
+
+    def __init__(self, recent_entries: int = 1024) -> None:
+        self.recent_entries = recent_entries
+        self.coalesced = 0
+        self.reused = 0
+        self._in_flight: Dict[str, asyncio.Future[str]] = {}
+        self._done: "OrderedDict[str, str]" = OrderedDict()
+
+    async def run(self, key: str, request: Callable[[], Awaitable[str]]) -> str:
+        done = self._done.get(key)
+        if done is not None:
+            self._done.move_to_end(key)
+            self.reused += 1
+            return done
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            response = await request()
+        except BaseException as exc:
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(exc)
+                # Followers re-raise it; mark it retrieved so an unobserved failure does not warn.
+                future.exception()
+            raise
+        else:
+            if self.recent_entries > 0:
+                self._done[key] = response
+                while len(self._done) > self.recent_entries:
+                    self._done.popitem(last=False)
+            future.set_result(response)
+            return response
+        finally:
+            del self._in_flight[key]
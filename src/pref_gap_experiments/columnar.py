@@ -0,0 +1,197 @@
+"""Columnar on-disk storage for experiment reports.
+
+A store is a directory holding:
+
+``index.json``
+    Per-strategy summary (average score, result count and, for sampled runs,
+    statistics). Plotting and aggregation read only this file.
+``strings.json``
+    The interned string table. Responses and notes are stored once and
+    referenced by position, so a system prompt repeated on every result costs
+    four bytes per row instead of its full text.
+``scenario_ids.json``
+    A separate table for scenario ids, so they can be resolved without
+    parsing the (much larger) response text.
+``NNNN/<column>.bin``
+    One directory per strategy (named in the index) with one little-endian
+    typed array per column (``u32`` string references, ``f64`` scores, ``u64``
+    offsets into variable-length columns).
+
+Only the columns a reader asks for are read: ``read_scores`` touches the score
+column alone, and ``read_columnar(..., include_text=False)`` skips the string
+table.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .evaluation import AlignmentReport, AlignmentResult
+
+FORMAT = "pref-gap-columnar"
+VERSION = 1
+INDEX_FILE = "index.json"
+STRINGS_FILE = "strings.json"
+IDS_FILE = "scenario_ids.json"
+
+# Column name -> array typecode. Itemsizes are checked in ``_typed``.
+COLUMNS = {
+    "scenario_id": "I",
+    "stated_preference": "I",
+    "conflict_response": "I",
+    "score": "d",
+    "notes_offsets": "Q",
+    "notes_keys": "I",
+    "notes_values": "I",
+    "sample_offsets": "Q",
+    "sample_scores": "d",
+}
+_ITEMSIZE = {"I": 4, "d": 8, "Q": 8}
+
+
+class StringTable:
+    """Dictionary-encodes strings: each distinct string is stored once."""
+
+    def __init__(self, strings: Sequence[str] = ()) -> None:
+        self.strings: List[str] = list(strings)
+        self._ids: Dict[str, int] = {value: index for index, value in enumerate(self.strings)}
+
+    def intern(self, value: str) -> int:
+        index = self._ids.get(value)
+        if index is None:
+            index = self._ids[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def __getitem__(self, index: int) -> str:
+        return self.strings[index]
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+
+def is_columnar(path: Path | str) -> bool:
+    return (Path(path) / INDEX_FILE).is_file()
+
+
+def write_columnar(path: Path | str, reports: Dict[str, AlignmentReport]) -> Path:
+    """Write ``{strategy: report}`` as a columnar store at ``path`` (a directory)."""
+
+    root = Path(path)
+    root.mkdir(parents=True, exist_ok=True)
+    table = StringTable()
+    ids = StringTable()
+    strategies: Dict[str, Dict[str, object]] = {}
+    for position, (name, report) in enumerate(reports.items()):
+        directory = f"{position:04d}"
+        columns = {column: _typed(code) for column, code in COLUMNS.items()}
+        columns["notes_offsets"].append(0)
+        columns["sample_offsets"].append(0)
+        for result in report.results:
+            columns["scenario_id"].append(ids.intern(result.scenario_id))
+            columns["stated_preference"].append(table.intern(result.stated_preference))
+            columns["conflict_response"].append(table.intern(result.conflict_response))
+            columns["score"].append(result.score)
+            for key, value in result.notes.items():
+                columns["notes_keys"].append(table.intern(key))
+                columns["notes_values"].append(table.intern(str(value)))
+            columns["notes_offsets"].append(len(columns["notes_keys"]))
+            columns["sample_scores"].extend(result.sample_scores or ())
+            columns["sample_offsets"].append(len(columns["sample_scores"]))
+        (root / directory).mkdir(exist_ok=True)
+        for column, values in columns.items():
+            _write_array(root / directory / f"{column}.bin", values)
+        summary = report.to_summary()
+        summary["directory"] = directory
+        strategies[name] = summary
+    (root / STRINGS_FILE).write_text(json.dumps(table.strings, ensure_ascii=False))
+    (root / IDS_FILE).write_text(json.dumps(ids.strings, ensure_ascii=False))
+    index = {"format": FORMAT, "version": VERSION, "strategies": strategies}
+    (root / INDEX_FILE).write_text(json.dumps(index, indent=2))
+    return root
+
+
+def read_summary(path: Path | str) -> Dict[str, Dict[str, object]]:
+    """Return the per-strategy summary index without touching any result column."""
+
+    index = json.loads((Path(path) / INDEX_FILE).read_text())
+    if index.get("format") != FORMAT:
+        raise ValueError(f"{path} is not a columnar report store")
+    if index.get("version", 0) > VERSION:
+        raise ValueError(f"{path} uses columnar format version {index['version']}; this reader supports {VERSION}")
+    return index["strategies"]
+
+
+def read_scores(path: Path | str, strategy: str) -> List[float]:
+    """Read just the per-scenario score column of one strategy."""
+
+    directory = Path(path) / str(read_summary(path)[strategy]["directory"])
+    return list(_read_array(directory / "score.bin", COLUMNS["score"]))
+
+
+def read_columnar(
+    path: Path | str, strategies: Optional[Iterable[str]] = None, *, include_text: bool = True
+) -> Dict[str, AlignmentReport]:
+    """Load reports from a columnar store.
+
+    With ``include_text=False`` the string table is not loaded and responses
+    and notes come back empty; scenario ids and scores are still filled in.
+    """
+
+    root = Path(path)
+    summary = read_summary(root)
+    names = list(summary) if strategies is None else list(strategies)
+    ids = json.loads((root / IDS_FILE).read_text()) if names else []
+    strings = json.loads((root / STRINGS_FILE).read_text()) if names and include_text else []
+    reports: Dict[str, AlignmentReport] = {}
+    for name in names:
+        directory = root / str(summary[name]["directory"])
+        wanted = list(COLUMNS) if include_text else ["scenario_id", "score", "sample_offsets", "sample_scores"]
+        columns = {column: _read_array(directory / f"{column}.bin", COLUMNS[column]) for column in wanted}
+        results = []
+        for row, score in enumerate(columns["score"]):
+            start, end = columns["sample_offsets"][row], columns["sample_offsets"][row + 1]
+            notes: Dict[str, str] = {}
+            if include_text:
+                first, last = columns["notes_offsets"][row], columns["notes_offsets"][row + 1]
+                notes = {
+                    strings[columns["notes_keys"][i]]: strings[columns["notes_values"][i]] for i in range(first, last)
+                }
+            results.append(
+                AlignmentResult(
+                    scenario_id=ids[columns["scenario_id"][row]],
+                    stated_preference=strings[columns["stated_preference"][row]] if include_text else "",
+                    conflict_response=strings[columns["conflict_response"][row]] if include_text else "",
+                    score=score,
+                    notes=notes,
+                    sample_scores=list(columns["sample_scores"][start:end]) if end > start else None,
+                )
+            )
+        reports[name] = AlignmentReport(results)
+    return reports
+
+
+def _typed(code: str) -> array:
+    values = array(code)
+    if values.itemsize != _ITEMSIZE[code]:
+        raise RuntimeError(f"array typecode {code!r} is {values.itemsize} bytes on this platform")
+    return values
+
+
+def _write_array(path: Path, values: array) -> None:
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    path.write_bytes(values.tobytes())
+
+
+def _read_array(path: Path, code: str) -> array:
+    values = _typed(code)
+    values.frombytes(path.read_bytes())
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
@@ -2,13 +2,18 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Scenario:
-    """Describes a scenario probing stated vs revealed value preferences."""
+    """Describes a scenario probing stated vs revealed value preferences.
+
+    Identifiers, value names and evaluation instructions are interned, since
+    large datasets repeat them across many scenarios.
+    """
 
     identifier: str
     stated_preference_prompt: str
@@ -16,6 +21,11 @@ class Scenario:
     target_ranking: List[str]
     evaluation_instructions: str
 
+    def __post_init__(self) -> None:
+        self.identifier = sys.intern(self.identifier)
+        self.target_ranking = [sys.intern(value) for value in self.target_ranking]
+        self.evaluation_instructions = sys.intern(self.evaluation_instructions)
+
 
 @dataclass
 class StrategyConfig:
@@ -25,17 +35,80 @@ class StrategyConfig:
     parameters: Dict[str, str] = field(default_factory=dict)
 
 
+@dataclass
+class ModelEndpoint:
+    """One model evaluated by a multi-model run.
+
+    ``name`` labels the endpoint's reports and defaults to ``model``.
+    ``base_url`` and ``api_key_env`` (the environment variable holding the
+    key) point the OpenAI-compatible client at another provider.
+    ``parallelism`` overrides the run's concurrency budget for this endpoint
+    and sizes its HTTP connection pool. The per-minute budgets are enforced
+    separately for each endpoint.
+    """
+
+    model: str
+    name: Optional[str] = None
+    base_url: Optional[str] = None
+    api_key_env: Optional[str] = None
+    parallelism: Optional[int] = None
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+
+    @property
+    def label(self) -> str:
+        return self.name or self.model
+
+
 @dataclass
 class ExperimentConfig:
-    """Holds all configuration required for an experiment run."""
+    """Holds all configuration required for an experiment run.
+
+    ``scenarios`` may be any iterable, such as a ``StreamingScenarioDataset``;
+    the runner iterates it once.
+
+    ``concurrent_queries`` issues a scenario's stated and conflict queries
+    together. At temperature 0, ``deduplicate_requests`` sends byte-identical
+    requests once and shares the response. Within windows of
+    ``prefix_window`` units, requests are issued grouped by system prompt so
+    provider prompt caches stay warm.
+
+    With ``stream_responses`` responses are consumed as token streams, and
+    with ``early_termination`` a stream is cut off once it has mentioned every
+    target value.
+
+    With ``samples_per_scenario > 1`` each scenario is sampled repeatedly. If
+    ``target_ci_half_width`` is set, sampling a scenario stops early once at
+    least ``min_samples`` have been drawn and the normal-approximation
+    ``confidence`` interval of its mean score is at most that half-width.
+
+    With ``compact_results`` each strategy's results are kept in a
+    ``CompactResults`` column store as they complete; ``spill_dir``
+    additionally moves response text to a temporary file in that directory.
+
+    ``models`` lists the endpoints of a multi-model run (see
+    ``MultiModelRunner``); a single-model run uses ``llm_model`` alone.
+    """
 
-    scenarios: List[Scenario]
+    scenarios: Iterable[Scenario]
     strategies: List[StrategyConfig]
     llm_model: str
     temperature: float = 0.0
     max_tokens: Optional[int] = None
     parallelism: int = 4
     system_values: Optional[List[str]] = None
+    concurrent_queries: bool = True
+    deduplicate_requests: bool = True
+    samples_per_scenario: int = 1
+    min_samples: int = 3
+    target_ci_half_width: Optional[float] = None
+    confidence: float = 0.95
+    prefix_window: int = 256
+    stream_responses: bool = False
+    early_termination: bool = True
+    compact_results: bool = False
+    spill_dir: Optional[str] = None
+    models: List[ModelEndpoint] = field(default_factory=list)
 
     def get_strategy_params(self, name: str) -> Dict[str, str]:
         for strategy in self.strategies:
@@ -1,17 +1,19 @@
-"""Utilities for loading scenario datasets from structured files."""
+"""Utilities for loading scenario datasets from structured files.
+
+Besides JSON and YAML documents with a top-level ``scenarios`` list, datasets
+may be stored as JSONL with one scenario object per line. JSONL files can be
+read lazily through ``StreamingScenarioDataset``, which also supports sharding
+and filtering by identifier.
+"""
 
 from __future__ import annotations
 
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Iterator, List
-
-try:
-    import yaml
-except ModuleNotFoundError:  # pragma: no cover - optional dependency
-    yaml = None  # type: ignore
+from typing import FrozenSet, Iterable, Iterator, List, Optional, Tuple
 
+from ._optional import optional_module
 from .config import Scenario
 
 
@@ -23,19 +25,25 @@ class ScenarioDataset:
 
     @classmethod
     def from_file(cls, path: Path | str) -> "ScenarioDataset":
-        path = Path(path)
-        text = path.read_text()
-        suffix = path.suffix.lower()
-        if suffix in {".yaml", ".yml"}:
-            if yaml is None:
-                raise ModuleNotFoundError("PyYAML is required to load YAML scenario files")
-            loaded = yaml.safe_load(text)
-        elif suffix == ".json":
-            loaded = json.loads(text)
-        else:
-            raise ValueError(f"Unsupported scenario file format: {path.suffix}")
-        scenarios = [Scenario(**scenario) for scenario in loaded["scenarios"]]
-        return cls(scenarios)
+        return cls(list(iter_scenarios(path)))
+
+    @classmethod
+    def stream(
+        cls,
+        path: Path | str,
+        *,
+        shard: Tuple[int, int] = (0, 1),
+        include: Iterable[str] | None = None,
+    ) -> "StreamingScenarioDataset":
+        """Return a lazily parsed view of ``path``; see ``StreamingScenarioDataset``."""
+
+        shard_index, shard_count = shard
+        return StreamingScenarioDataset(
+            Path(path),
+            shard_index=shard_index,
+            shard_count=shard_count,
+            include=frozenset(include) if include is not None else None,
+        )
 
     @classmethod
     def from_yaml(cls, path: Path | str) -> "ScenarioDataset":
@@ -51,3 +59,78 @@ class ScenarioDataset:
 
     def extend(self, more: Iterable[Scenario]) -> None:
         self.scenarios.extend(more)
+
+
+@dataclass(frozen=True)
+class StreamingScenarioDataset:
+    """Re-iterable dataset that parses scenarios on demand.
+
+    Each iteration re-reads the file. Scenario ``i`` (by position in the
+    file) belongs to shard ``i % shard_count``; for JSONL files lines outside
+    the shard are skipped without being parsed. When ``include`` is set, only
+    scenarios with those identifiers are yielded.
+    """
+
+    path: Path
+    shard_index: int = 0
+    shard_count: int = 1
+    include: Optional[FrozenSet[str]] = None
+
+    def __post_init__(self) -> None:
+        if self.shard_count < 1 or not 0 <= self.shard_index < self.shard_count:
+            raise ValueError(f"Invalid shard {self.shard_index}/{self.shard_count}")
+
+    def __iter__(self) -> Iterator[Scenario]:
+        for scenario in iter_scenarios(self.path, shard=(self.shard_index, self.shard_count)):
+            if self.include is None or scenario.identifier in self.include:
+                yield scenario
+
+    def identifiers(self) -> List[str]:
+        return [scenario.identifier for scenario in self]
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse an ``"i/n"`` shard specification."""
+
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError as exc:
+        raise ValueError(f"Shard must look like 'i/n', got '{spec}'") from exc
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {spec}")
+    return index, count
+
+
+def iter_scenarios(path: Path | str, *, shard: Tuple[int, int] = (0, 1)) -> Iterator[Scenario]:
+    """Yield the scenarios stored in ``path`` that fall in ``shard``.
+
+    JSONL files are read line by line; JSON and YAML documents are parsed in
+    full first since their formats do not allow incremental reads.
+    """
+
+    path = Path(path)
+    shard_index, shard_count = shard
+    suffix = path.suffix.lower()
+    if suffix == ".jsonl":
+        with path.open(encoding="utf-8") as handle:
+            position = 0
+            for line in handle:
+                if not line.strip():
+                    continue
+                if position % shard_count == shard_index:
+                    yield Scenario(**json.loads(line))
+                position += 1
+        return
+    text = path.read_text()
+    if suffix in {".yaml", ".yml"}:
+        yaml = optional_module("yaml")
+        if yaml is None:
+            raise ModuleNotFoundError("PyYAML is required to load YAML scenario files")
+        loaded = yaml.safe_load(text)
+    elif suffix == ".json":
+        loaded = json.loads(text)
+    else:
+        raise ValueError(f"Unsupported scenario file format: {path.suffix}")
+    for position, scenario in enumerate(loaded["scenarios"]):
+        if position % shard_count == shard_index:
+            yield Scenario(**scenario)
@@ -2,18 +2,38 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Type
+import asyncio
+import sys
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, Iterator, List, Optional, Tuple, Type
 
+from .checkpoint import CheckpointJournal, CheckpointKey
+from .coalescing import RequestCoalescer, request_key
 from .config import ExperimentConfig, Scenario
-from .evaluation import AlignmentReport, AlignmentResult, score_conflict_response
-from .llm import LLMClient, gather_with_concurrency
+from .evaluation import (
+    AlignmentReport,
+    AlignmentResult,
+    CompactResults,
+    aggregate_samples,
+    score_conflict_response,
+)
+from .llm import LLMClient, stream_with_concurrency
+from .matching import MentionTracker, matcher_for
+from .sinks import ResultSink
+from .stats import normal_half_width
 from .strategies import (
     BaselinePromptStrategy,
+    PromptBuilder,
     PromptStrategy,
     RankedValuesPromptStrategy,
     SafetyAppendPromptStrategy,
+    compile_strategy,
 )
+from .telemetry import Telemetry, annotate, track_usage
+
+if TYPE_CHECKING:
+    from .manifest import IncrementalRun, UnitFingerprint
 
 STRATEGY_REGISTRY: Dict[str, Type[PromptStrategy]] = {
     "baseline": BaselinePromptStrategy,
@@ -21,58 +41,311 @@ STRATEGY_REGISTRY: Dict[str, Type[PromptStrategy]] = {
     "safety_append": SafetyAppendPromptStrategy,
 }
 
+# Installed packages can add strategies by declaring entry points in this group, e.g.
+#   [project.entry-points."pref_gap_experiments.strategies"]
+#   my_strategy = "my_package.strategies:MyStrategy"
+STRATEGY_ENTRY_POINT_GROUP = "pref_gap_experiments.strategies"
+_entry_points_loaded = False
+
+
+def load_strategy_entry_points() -> None:
+    """Add strategies declared under ``STRATEGY_ENTRY_POINT_GROUP`` to ``STRATEGY_REGISTRY``.
+
+    Names already in the registry (including the built-ins) are not replaced.
+    The runner calls this the first time it meets an unknown strategy name.
+    """
+
+    global _entry_points_loaded
+    from importlib.metadata import entry_points
+
+    for entry_point in entry_points(group=STRATEGY_ENTRY_POINT_GROUP):
+        if entry_point.name not in STRATEGY_REGISTRY:
+            STRATEGY_REGISTRY[entry_point.name] = entry_point.load()
+    _entry_points_loaded = True
+
+
+# A single unit of scheduled work: (strategy index, strategy, scenario index, scenario).
+WorkUnit = Tuple[int, PromptStrategy, int, Scenario]
+# A work unit together with the prompts built for it.
+PreparedUnit = Tuple[WorkUnit, Dict[str, str]]
+
+
+class _CompactSlot:
+    """Collects one strategy's results into ``CompactResults`` as they complete."""
+
+    def __init__(self, spill_dir: Optional[str]) -> None:
+        self.store = CompactResults(spill=spill_dir)
+
+    def __setitem__(self, scenario_index: int, result: AlignmentResult) -> None:
+        self.store.put(scenario_index, result)
+
+    def report(self) -> AlignmentReport:
+        self.store.sort_by_position()
+        return AlignmentReport(self.store)
+
+
+# Per-strategy results keyed by scenario index.
+ResultSlots = List["Dict[int, AlignmentResult] | _CompactSlot"]
+
 
 @dataclass
 class ExperimentRunner:
-    """Coordinates experiment execution for multiple strategies."""
+    """Coordinates experiment execution for multiple strategies.
+
+    All (strategy, scenario) pairs form one lazily consumed work stream with
+    at most ``config.parallelism`` units in flight (LLM calls share a
+    semaphore of the same size), so the budget stays saturated across
+    strategy boundaries. Results go to the optional ``sink`` as they are
+    scored; ``checkpoint`` and ``incremental`` skip units already done or
+    unchanged, and ``telemetry`` records per-stage spans. ``coalescer`` and
+    ``early_stops`` expose request deduplication and early stream
+    termination counts. Strategy names missing from ``STRATEGY_REGISTRY``
+    are looked up in installed entry points. See ``ExperimentConfig`` for the
+    options that control sampling, streaming, request ordering and result
+    storage.
+    """
 
     config: ExperimentConfig
     client: LLMClient
+    sink: Optional[ResultSink] = None
+    checkpoint: Optional[CheckpointJournal] = None
+    telemetry: Optional[Telemetry] = None
+    incremental: Optional[IncrementalRun] = None
+    coalescer: Optional[RequestCoalescer] = field(default=None, init=False, repr=False)
+    early_stops: int = field(default=0, init=False)
+    _call_slots: Optional[asyncio.Semaphore] = field(default=None, init=False, repr=False)
+    _templates: List[PromptBuilder] = field(default_factory=list, init=False, repr=False)
 
     async def run(self) -> Dict[str, AlignmentReport]:
+        self._call_slots = asyncio.Semaphore(max(1, self.config.parallelism))
+        # At temperature > 0 identical requests are independent samples, so only dedupe deterministic runs.
+        dedupe = self.config.deduplicate_requests and self.config.temperature == 0
+        self.coalescer = RequestCoalescer() if dedupe else None
+        if self.telemetry is not None:
+            self.telemetry.start()
+        strategies = [
+            self._instantiate_strategy(strategy_config.name, strategy_config.parameters)
+            for strategy_config in self.config.strategies
+        ]
+        slots: ResultSlots = [
+            _CompactSlot(self.config.spill_dir) if self.config.compact_results else {} for _ in strategies
+        ]
+        completed = self.checkpoint.completed() if self.checkpoint is not None else {}
+        self._templates = [compile_strategy(strategy, self.config.system_values) for strategy in strategies]
+        units = self._prefix_ordered(self._work_units(strategies, slots, completed), slots)
+        await self._schedule(units, slots)
+        if self.telemetry is not None:
+            self.telemetry.finish()
         reports: Dict[str, AlignmentReport] = {}
-        for strategy_config in self.config.strategies:
-            strategy = self._instantiate_strategy(strategy_config.name, strategy_config.parameters)
-            results = await self._run_strategy(strategy)
-            reports[strategy.name] = AlignmentReport(results)
+        for strategy, results in zip(strategies, slots, strict=True):
+            if isinstance(results, _CompactSlot):
+                reports[strategy.name] = results.report()
+            else:
+                reports[strategy.name] = AlignmentReport([results[index] for index in sorted(results)])
         return reports
 
-    async def _run_strategy(self, strategy: PromptStrategy) -> List[AlignmentResult]:
-        prompts = [strategy.build_prompts(scenario, self.config.system_values) for scenario in self.config.scenarios]
-        coroutines = []
-        for scenario, prompt_pack in zip(self.config.scenarios, prompts, strict=True):
-            coroutines.append(
-                self._evaluate_scenario(
-                    scenario,
-                    prompt_pack,
-                )
-            )
-        return await gather_with_concurrency(self.config.parallelism, coroutines)
+    def _work_units(
+        self,
+        strategies: List[PromptStrategy],
+        slots: ResultSlots,
+        completed: Dict[CheckpointKey, AlignmentResult],
+    ) -> Iterator[WorkUnit]:
+        # Scenario-major order walks ``config.scenarios`` exactly once, so a
+        # streaming dataset is parsed lazily and never held in memory as a whole.
+        for scenario_index, scenario in enumerate(self.config.scenarios):
+            for strategy_index, strategy in enumerate(strategies):
+                previous = completed.get((strategy.name, scenario.identifier))
+                if previous is not None:
+                    slots[strategy_index][scenario_index] = previous
+                    if self.incremental is not None:
+                        # Restored units were generated by this configuration too; keep them in the manifest.
+                        prompt_pack = self._templates[strategy_index].build(scenario)
+                        fingerprint = self._fingerprint(strategy, scenario, prompt_pack)
+                        self.incremental.record(strategy.name, scenario, fingerprint)
+                    continue
+                yield strategy_index, strategy, scenario_index, scenario
+
+    def _prefix_ordered(
+        self, units: Iterator[WorkUnit], slots: ResultSlots
+    ) -> Iterator[PreparedUnit]:
+        """Build each unit's prompts and reorder units so those sharing a system prompt run back to back.
+
+        Units are buffered ``config.prefix_window`` at a time and stably sorted
+        by system prompt, which keeps memory bounded for streaming datasets
+        while letting provider-side prompt caching reuse each shared prefix.
+        Units that an ``incremental`` run can answer from the previous report
+        are filled in directly and never scheduled.
+        """
+
+        window = max(1, self.config.prefix_window)
+        buffer: List[PreparedUnit] = []
+        for unit in units:
+            strategy_index, strategy, scenario_index, scenario = unit
+            with self._span("prompt.build", strategy=strategy.name):
+                prompt_pack = self._templates[strategy_index].build(scenario)
+            if self.incremental is not None:
+                fingerprint = self._fingerprint(strategy, scenario, prompt_pack)
+                previous = self.incremental.reuse(strategy.name, scenario, prompt_pack, fingerprint)
+                if previous is not None:
+                    slots[strategy_index][scenario_index] = previous
+                    continue
+            buffer.append((unit, prompt_pack))
+            if len(buffer) >= window:
+                yield from self._sorted_by_prefix(buffer)
+                buffer = []
+        yield from self._sorted_by_prefix(buffer)
+
+    def _fingerprint(
+        self, strategy: PromptStrategy, scenario: Scenario, prompt_pack: Dict[str, str]
+    ) -> UnitFingerprint:
+        from .manifest import fingerprint_unit
+
+        return fingerprint_unit(self.config, self.client.model, strategy.name, scenario, prompt_pack)
+
+    @staticmethod
+    def _sorted_by_prefix(buffer: List[PreparedUnit]) -> List[PreparedUnit]:
+        if len(buffer) < 2:
+            return buffer
+        first_seen: Dict[str, int] = {}
+        for _, prompt_pack in buffer:
+            first_seen.setdefault(prompt_pack["system"], len(first_seen))
+        # Groups keep the order in which their prefix first appeared, so the window stays roughly in input order.
+        return sorted(buffer, key=lambda prepared: first_seen[prepared[1]["system"]])
+
+    async def _schedule(self, units: Iterator[PreparedUnit], slots: ResultSlots) -> None:
+        """Evaluate ``units`` with bounded concurrency, storing and streaming results."""
+
+        evaluations = (self._evaluate_unit(unit, prompt_pack) for unit, prompt_pack in units)
+        async for _, (unit, result) in stream_with_concurrency(self.config.parallelism, evaluations):
+            strategy_index, strategy, scenario_index, _ = unit
+            slots[strategy_index][scenario_index] = result
+            with self._span("serialize"):
+                if self.checkpoint is not None:
+                    self.checkpoint.write(strategy.name, scenario_index, result)
+                if self.sink is not None:
+                    self.sink.write(strategy.name, scenario_index, result)
+
+    async def _evaluate_unit(self, unit: WorkUnit, prompt_pack: Dict[str, str]) -> Tuple[WorkUnit, AlignmentResult]:
+        scenario = unit[3]
+        with track_usage() as usage:
+            result = await self._evaluate_scenario(scenario, prompt_pack)
+        if usage.prompt_tokens:
+            result.notes.update(usage.as_notes())
+        return unit, result
 
     async def _evaluate_scenario(
         self, scenario: Scenario, prompt_pack: Dict[str, str]
     ) -> AlignmentResult:
-        system_prompt = prompt_pack["system"]
-        stated_response = await self.client.generate(
-            system=system_prompt,
-            prompt=prompt_pack["stated_query"],
-            temperature=self.config.temperature,
-            max_tokens=self.config.max_tokens,
+        maximum = max(1, self.config.samples_per_scenario)
+        if maximum == 1:
+            return await self._sample_scenario(scenario, prompt_pack)
+        early_stopping = self.config.target_ci_half_width is not None
+        # Draw the minimum number of samples concurrently, then one at a time so
+        # sampling can stop as soon as the interval is tight enough.
+        initial = min(maximum, max(1, self.config.min_samples)) if early_stopping else maximum
+        samples = list(
+            await asyncio.gather(*(self._sample_scenario(scenario, prompt_pack) for _ in range(initial)))
         )
-        conflict_response = await self.client.generate(
-            system=system_prompt,
-            prompt=prompt_pack["conflict_query"],
+        while len(samples) < maximum and not self._converged(samples):
+            samples.append(await self._sample_scenario(scenario, prompt_pack))
+        return aggregate_samples(samples)
+
+    def _converged(self, samples: List[AlignmentResult]) -> bool:
+        target = self.config.target_ci_half_width
+        if target is None:
+            return False
+        half_width = normal_half_width([sample.score for sample in samples], self.config.confidence)
+        return half_width <= target
+
+    async def _sample_scenario(self, scenario: Scenario, prompt_pack: Dict[str, str]) -> AlignmentResult:
+        system_prompt = prompt_pack["system"]
+        values = scenario.target_ranking
+        if self.config.concurrent_queries:
+            stated_response, conflict_response = await asyncio.gather(
+                self._generate(system_prompt, prompt_pack["stated_query"], values),
+                self._generate(system_prompt, prompt_pack["conflict_query"], values),
+            )
+        else:
+            stated_response = await self._generate(system_prompt, prompt_pack["stated_query"], values)
+            conflict_response = await self._generate(system_prompt, prompt_pack["conflict_query"], values)
+        with self._span("score"):
+            return score_conflict_response(
+                scenario,
+                stated_response=stated_response,
+                conflict_response=conflict_response,
+                # Interned so every result of a strategy shares one copy of its system prompt.
+                evaluation_notes={"system_prompt": sys.intern(system_prompt)},
+            )
+
+    async def _generate(self, system: str, prompt: str, values: List[str]) -> str:
+        if self.coalescer is None:
+            return await self._call(system, prompt, values)
+        # A truncated response depends on the values it was checked against.
+        extra = list(values) if self.config.stream_responses and self.config.early_termination else None
+        key = request_key(
+            model=self.client.model,
+            system=system,
+            prompt=prompt,
             temperature=self.config.temperature,
             max_tokens=self.config.max_tokens,
+            extra=extra,
         )
-        return score_conflict_response(
-            scenario,
-            stated_response=stated_response,
-            conflict_response=conflict_response,
-            evaluation_notes={"system_prompt": system_prompt},
+        return await self.coalescer.run(key, lambda: self._call(system, prompt, values))
+
+    async def _call(self, system: str, prompt: str, values: List[str]) -> str:
+        if self._call_slots is None:
+            self._call_slots = asyncio.Semaphore(max(1, self.config.parallelism))
+        with self._span("llm.wait"):
+            await self._call_slots.acquire()
+        try:
+            with self._span("llm.generate"):
+                if self.config.stream_responses:
+                    return await self._stream(system, prompt, values)
+                return await self.client.generate(
+                    system=system,
+                    prompt=prompt,
+                    temperature=self.config.temperature,
+                    max_tokens=self.config.max_tokens,
+                )
+        finally:
+            self._call_slots.release()
+
+    async def _stream(self, system: str, prompt: str, values: List[str]) -> str:
+        """Consume a streamed response, stopping once further text cannot change its score.
+
+        That is the case once every value has been mentioned: the mention
+        count is then at its maximum.
+        """
+
+        started = self.telemetry.now() if self.telemetry is not None else 0.0
+        tracker = MentionTracker(matcher_for(values))
+        chunks: List[str] = []
+        stream = self.client.stream(
+            system=system, prompt=prompt, temperature=self.config.temperature, max_tokens=self.config.max_tokens
         )
+        try:
+            async for chunk in stream:
+                if not chunks and self.telemetry is not None:
+                    self.telemetry.record("llm.first_token", started)
+                chunks.append(chunk)
+                if not self.config.early_termination:
+                    continue
+                if tracker.feed(chunk):
+                    self.early_stops += 1
+                    annotate(early_stop=1)
+                    break
+        finally:
+            await stream.aclose()
+        return "".join(chunks)
+
+    def _span(self, name: str, **attributes: Any) -> ContextManager[Any]:
+        if self.telemetry is None:
+            return nullcontext()
+        return self.telemetry.span(name, **attributes)
 
     def _instantiate_strategy(self, name: str, params: Dict[str, str]) -> PromptStrategy:
+        if name not in STRATEGY_REGISTRY and not _entry_points_loaded:
+            load_strategy_entry_points()
         if name not in STRATEGY_REGISTRY:
             raise KeyError(f"Unknown strategy '{name}'")
         return STRATEGY_REGISTRY[name](**params)
@@ -0,0 +1,148 @@
+"""Multi-model runs: every strategy evaluated against several endpoints at once.
+
+``MultiModelRunner`` gives each ``ModelEndpoint`` its own client and its own
+``ExperimentRunner`` (with its own concurrency budget and request
+coalescing), and runs them concurrently. A slow or throttled endpoint
+therefore only holds up its own pipeline; the others keep their call slots
+busy. Reports are keyed by ``(endpoint label, strategy)`` and flattened to
+``"<label>/<strategy>"`` names (see ``report_name``) when serialized.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from dataclasses import dataclass, field, replace
+from typing import Dict, Mapping, Optional, Tuple
+
+from ._optional import optional_module
+from .config import ExperimentConfig, ModelEndpoint
+from .evaluation import AlignmentReport, AlignmentResult
+from .experiments import ExperimentRunner
+from .llm import LLMClient, OpenAIClient
+from .ratelimit import AIMDController, RateLimiter, RetryPolicy
+from .sinks import ResultSink
+from .telemetry import Telemetry
+
+ReportKey = Tuple[str, str]
+
+
+def report_name(label: str, strategy: str) -> str:
+    return f"{label}/{strategy}"
+
+
+def split_report_name(name: str) -> ReportKey:
+    """Inverse of ``report_name``; labels may contain ``/`` but strategy names do not."""
+
+    label, _, strategy = name.rpartition("/")
+    return label, strategy
+
+
+@dataclass
+class _EndpointSink:
+    """Forwards results under ``report_name(label, strategy)``; the owner closes the wrapped sink."""
+
+    sink: ResultSink
+    label: str
+
+    def write(self, strategy: str, index: int, result: AlignmentResult) -> None:
+        self.sink.write(report_name(self.label, strategy), index, result)
+
+    def close(self) -> None:
+        pass
+
+
+@dataclass
+class MultiModelRunner:
+    """Runs all strategies against every endpoint in ``config.models`` concurrently.
+
+    ``clients`` maps each endpoint's label to its client. Each endpoint runs
+    with ``endpoint.parallelism`` (or ``config.parallelism``) units in flight.
+    ``config.scenarios`` is iterated once per endpoint, so it must be
+    re-iterable (a list or a dataset, not a generator). An endpoint whose run
+    raises is recorded in ``failures`` and left out of the returned reports
+    instead of aborting the others; ``runners`` exposes each endpoint's
+    ``ExperimentRunner`` for its statistics.
+    """
+
+    config: ExperimentConfig
+    clients: Mapping[str, LLMClient]
+    sink: Optional[ResultSink] = None
+    telemetry: Optional[Telemetry] = None
+    runners: Dict[str, ExperimentRunner] = field(default_factory=dict, init=False)
+    failures: Dict[str, BaseException] = field(default_factory=dict, init=False)
+
+    async def run(self) -> Dict[ReportKey, AlignmentReport]:
+        labels = [endpoint.label for endpoint in self.config.models]
+        if len(set(labels)) != len(labels):
+            raise ValueError(f"Model endpoint labels must be unique, got {labels}")
+        missing = [label for label in labels if label not in self.clients]
+        if missing:
+            raise KeyError(f"No client for model endpoints {missing}")
+        self.runners = {
+            endpoint.label: ExperimentRunner(
+                config=self.endpoint_config(endpoint),
+                client=self.clients[endpoint.label],
+                sink=_EndpointSink(self.sink, endpoint.label) if self.sink is not None else None,
+                telemetry=self.telemetry,
+            )
+            for endpoint in self.config.models
+        }
+        outcomes = await asyncio.gather(
+            *(runner.run() for runner in self.runners.values()), return_exceptions=True
+        )
+        reports: Dict[ReportKey, AlignmentReport] = {}
+        for label, outcome in zip(self.runners, outcomes, strict=True):
+            if isinstance(outcome, BaseException):
+                if isinstance(outcome, asyncio.CancelledError):
+                    raise outcome
+                self.failures[label] = outcome
+                continue
+            for strategy, report in outcome.items():
+                reports[(label, strategy)] = report
+        return reports
+
+    def endpoint_config(self, endpoint: ModelEndpoint) -> ExperimentConfig:
+        return replace(
+            self.config,
+            llm_model=endpoint.model,
+            parallelism=endpoint.parallelism or self.config.parallelism,
+            models=[],
+        )
+
+
+def openai_endpoint_client(
+    endpoint: ModelEndpoint,
+    parallelism: int,
+    *,
+    retry_policy: RetryPolicy | None = None,
+    adaptive_concurrency: bool = False,
+) -> OpenAIClient:  # pragma: no cover - requires the openai package
+    """An ``OpenAIClient`` with its own connection pool and budgets for ``endpoint``.
+
+    The pool holds as many connections as the endpoint has calls in flight,
+    so concurrent calls never queue for a connection and idle endpoints do
+    not hold sockets open beyond that.
+    """
+
+    openai = optional_module("openai")
+    httpx = optional_module("httpx")
+    if openai is None or httpx is None:
+        raise RuntimeError("openai package is not available")
+    size = max(1, endpoint.parallelism or parallelism)
+    http_client = openai.DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_connections=size, max_keepalive_connections=size)
+    )
+    api_key = os.environ[endpoint.api_key_env] if endpoint.api_key_env else None
+    rate_limiter = None
+    if endpoint.requests_per_minute or endpoint.tokens_per_minute:
+        rate_limiter = RateLimiter(endpoint.requests_per_minute, endpoint.tokens_per_minute)
+    return OpenAIClient(
+        model=endpoint.model,
+        client=openai.AsyncOpenAI(
+            base_url=endpoint.base_url, api_key=api_key, http_client=http_client, max_retries=0
+        ),
+        rate_limiter=rate_limiter,
+        retry_policy=retry_policy,
+        concurrency=AIMDController(initial=size, maximum=size) if adaptive_concurrency else None,
+    )
@@ -4,13 +4,23 @@ from __future__ import annotations
 
 import abc
 import asyncio
+import re
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, List, Optional, Tuple, TypeVar
 
-try:
-    import openai
-except Exception:  # pragma: no cover - optional dependency may be missing
-    openai = None  # type: ignore
+from ._optional import optional_module
+from .ratelimit import (
+    AIMDController,
+    RateLimiter,
+    RetryPolicy,
+    estimate_tokens,
+    is_retryable,
+    is_throttle,
+    retry_after_seconds,
+)
+from .telemetry import annotate, record_usage
+
+T = TypeVar("T")
 
 
 class LLMClient(abc.ABC):
@@ -22,6 +32,17 @@ class LLMClient(abc.ABC):
     async def generate(self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]) -> str:
         """Return the model's response to the provided prompt."""
 
+    async def stream(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> AsyncIterator[str]:
+        """Yield the response in chunks as it is generated.
+
+        Closing the iterator early abandons the rest of the response. Clients
+        without native streaming yield the complete response as one chunk.
+        """
+
+        yield await self.generate(system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens)
+
 
 @dataclass
 class MockLLMClient(LLMClient):
@@ -38,46 +59,200 @@ class MockLLMClient(LLMClient):
             return self.scripted_responses[key]
         return "[[no-scripted-response]]"
 
+    async def stream(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> AsyncIterator[str]:
+        response = await self.generate(system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens)
+        # One chunk per word (with its trailing whitespace), roughly like a token stream.
+        for match in re.finditer(r"\s*\S+\s*", response):
+            yield match.group(0)
 
-class OpenAIClient(LLMClient):  # pragma: no cover - requires external service
-    """Wrapper around the OpenAI client."""
 
-    def __init__(self, model: str, client: Any | None = None) -> None:
+class OpenAIClient(LLMClient):
+    """Wrapper around the OpenAI client.
+
+    Transient failures (429s, 5xx, connection errors) are retried according to
+    ``retry_policy``; a client passed in should be built with ``max_retries=0``
+    so the SDK does not retry underneath it. An optional ``rate_limiter`` enforces request- and
+    token-per-minute budgets, and an optional ``concurrency`` controller adapts
+    the number of in-flight calls to observed throttling.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        client: Any | None = None,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        concurrency: AIMDController | None = None,
+    ) -> None:
         self.model = model
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.concurrency = concurrency
+        self.retries = 0
+        self.throttles = 0
         if client is not None:
             self._client = client
-        else:
+        else:  # pragma: no cover - requires external service
+            openai = optional_module("openai")
             if openai is None:
                 raise RuntimeError("openai package is not available")
-            self._client = openai.AsyncOpenAI()
+            # Retries are ours (``retry_policy``); SDK retries would multiply attempts and hide 429s.
+            self._client = openai.AsyncOpenAI(max_retries=0)
 
     async def generate(
         self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
     ) -> str:
-        response = await self._client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
-        return response.choices[0].message.content or ""
-
-
-async def gather_with_concurrency(
-    n: int, coroutines: Iterable[asyncio.Future[str] | asyncio.Task[str] | Any]
-) -> List[str]:
-    """Run coroutines with limited concurrency."""
-
-    semaphore = asyncio.Semaphore(n)
-    results: List[str] = []
-
-    async def run(coro: Any) -> str:
-        async with semaphore:
-            return await coro
-
-    for coro in asyncio.as_completed([run(c) for c in coroutines]):
-        results.append(await coro)
-    return results
+        estimated_tokens = estimate_tokens(system, prompt, max_tokens=max_tokens)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(estimated_tokens)
+            if self.concurrency is not None:
+                await self.concurrency.acquire()
+            throttled = False
+            try:
+                response = await self._client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                )
+            except Exception as exc:
+                throttled = is_throttle(exc)
+                self.throttles += int(throttled)
+                attempt += 1
+                if not is_retryable(exc) or attempt >= self.retry_policy.max_attempts:
+                    raise
+                delay = self.retry_policy.delay(attempt - 1, retry_after_seconds(exc))
+            else:
+                usage = getattr(response, "usage", None)
+                if usage is not None:
+                    details = getattr(usage, "prompt_tokens_details", None)
+                    cached = getattr(details, "cached_tokens", None) or 0
+                    record_usage(usage.prompt_tokens, usage.completion_tokens, cached)
+                return response.choices[0].message.content or ""
+            finally:
+                if self.concurrency is not None:
+                    await self.concurrency.release(throttled=throttled)
+            self.retries += 1
+            annotate(retries=1)
+            await asyncio.sleep(delay)
+
+    async def stream(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> AsyncIterator[str]:
+        """Stream the response, retrying failures that happen before the first chunk arrives.
+
+        Once chunks have been yielded an error is raised to the caller, since
+        replaying the request would repeat text it has already consumed.
+        """
+
+        estimated_tokens = estimate_tokens(system, prompt, max_tokens=max_tokens)
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire(estimated_tokens)
+            if self.concurrency is not None:
+                await self.concurrency.acquire()
+            throttled = False
+            started = False
+            response = None
+            try:
+                response = await self._client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system},
+                        {"role": "user", "content": prompt},
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                )
+                async for chunk in response:
+                    usage = getattr(chunk, "usage", None)
+                    if usage is not None:
+                        details = getattr(usage, "prompt_tokens_details", None)
+                        cached = getattr(details, "cached_tokens", None) or 0
+                        record_usage(usage.prompt_tokens, usage.completion_tokens, cached)
+                    if not chunk.choices:
+                        continue
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        started = True
+                        yield content
+                return
+            except Exception as exc:
+                throttled = is_throttle(exc)
+                self.throttles += int(throttled)
+                attempt += 1
+                if started or not is_retryable(exc) or attempt >= self.retry_policy.max_attempts:
+                    raise
+                delay = self.retry_policy.delay(attempt - 1, retry_after_seconds(exc))
+            finally:
+                close = getattr(response, "close", None)
+                if close is not None:
+                    # Closing the HTTP stream stops generation when the caller stops early.
+                    await close()
+                if self.concurrency is not None:
+                    await self.concurrency.release(throttled=throttled)
+            self.retries += 1
+            annotate(retries=1)
+            await asyncio.sleep(delay)
+
+
+async def stream_with_concurrency(n: int, work: Iterable[Awaitable[T]]) -> AsyncIterator[Tuple[int, T]]:
+    """Run awaitables with at most ``n`` in flight, yielding ``(index, result)`` as each completes.
+
+    ``work`` is consumed lazily: a new item is only pulled from the iterable
+    when a slot frees up, so passing a generator keeps memory flat regardless of
+    how many items it produces. ``index`` is the item's position in ``work``.
+    If an item raises (or the caller stops iterating), the remaining in-flight
+    tasks are cancelled and awaited before the error propagates.
+    """
+
+    items = enumerate(work)
+    pending: Dict[asyncio.Future[T], int] = {}
+
+    def refill() -> None:
+        while len(pending) < max(1, n):
+            try:
+                index, item = next(items)
+            except StopIteration:
+                return
+            pending[asyncio.ensure_future(item)] = index
+
+    refill()
+    finished: List[Tuple[int, asyncio.Future[T]]] = []
+    try:
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            finished = sorted(((pending.pop(task), task) for task in done), reverse=True)
+            refill()
+            while finished:
+                index, task = finished.pop()
+                yield index, task.result()
+    finally:
+        # Retrieve the outcome of completed tasks that were never yielded, so their errors are not logged as lost.
+        for _, task in finished:
+            if not task.cancelled():
+                task.exception()
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def gather_with_concurrency(n: int, coroutines: Iterable[Awaitable[T]]) -> List[T]:
+    """Run coroutines with limited concurrency, returning results in input order."""
+
+    results: Dict[int, T] = {}
+    async for index, result in stream_with_concurrency(n, coroutines):
+        results[index] = result
+    return [results[index] for index in range(len(results))]
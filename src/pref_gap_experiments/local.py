@@ -0,0 +1,295 @@
+"""Local (offline) inference backends.
+
+``LocalLLMClient`` collects the ``generate`` calls that arrive concurrently
+from the runner into micro-batches and hands each batch to a ``LocalBackend``
+on a dedicated worker thread, so CPU inference never blocks the event loop.
+While one batch runs, new calls queue up and form the next batch.
+
+Two backends are provided behind optional dependencies:
+
+* ``TransformersBackend`` (``pip install transformers torch``) runs each
+  batch as a single padded ``generate`` call and reuses the KV cache of the
+  shared system-prompt prefix across batches.
+* ``LlamaCppBackend`` (``pip install llama-cpp-python``) evaluates prompts
+  one after another, ordered so prompts sharing a system prompt are adjacent,
+  and keeps llama.cpp's prefix state cache warm.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, List, Optional, Protocol, Sequence, Tuple, TypeVar
+
+from ._optional import optional_module
+from .llm import LLMClient
+
+V = TypeVar("V")
+
+
+@dataclass(frozen=True)
+class LocalRequest:
+    system: str
+    prompt: str
+    temperature: float
+    max_tokens: Optional[int]
+
+
+class LocalBackend(Protocol):
+    """Synchronous inference engine driven by ``LocalLLMClient``'s worker thread."""
+
+    model: str
+
+    def generate_batch(self, requests: Sequence[LocalRequest]) -> List[str]:
+        """Return one completion per request, in request order."""
+
+
+class PrefixCache(Generic[V]):
+    """Small LRU of per-prefix inference state (e.g. KV caches), keyed by prefix text."""
+
+    def __init__(self, max_entries: int = 8) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, V]" = OrderedDict()
+
+    def get_or_create(self, prefix: str, build: Callable[[], V]) -> V:
+        if prefix in self._entries:
+            self._entries.move_to_end(prefix)
+            self.hits += 1
+            return self._entries[prefix]
+        self.misses += 1
+        value = build()
+        if self.max_entries > 0:
+            self._entries[prefix] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LocalLLMClient(LLMClient):
+    """Micro-batches concurrent calls onto a local backend running in a worker thread.
+
+    A batch is dispatched once ``max_batch_size`` calls are waiting or
+    ``max_wait`` seconds after the first call arrives, whichever comes first.
+    Within a batch, requests are grouped by system prompt (and sampling
+    parameters) so the backend sees shared prefixes back to back.
+    """
+
+    def __init__(self, backend: LocalBackend, *, max_batch_size: int = 8, max_wait: float = 0.01) -> None:
+        self.backend = backend
+        self.model = backend.model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self.batches = 0
+        self.batch_sizes: List[int] = []
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pref-gap-local")
+        self._pending: List[Tuple[LocalRequest, asyncio.Future[str]]] = []
+        self._dispatcher: Optional[asyncio.Task[None]] = None
+        self._batch_ready = asyncio.Event()
+
+    async def generate(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> str:
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._pending.append((LocalRequest(system, prompt, temperature, max_tokens), future))
+        if self._dispatcher is None or self._dispatcher.done():
+            self._batch_ready = asyncio.Event()
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+        if len(self._pending) >= self.max_batch_size:
+            self._batch_ready.set()
+        return await future
+
+    @property
+    def mean_batch_size(self) -> float:
+        return sum(self.batch_sizes) / max(1, len(self.batch_sizes))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            if len(self._pending) < self.max_batch_size:
+                # Give concurrently issued calls a moment to join this batch.
+                try:
+                    await asyncio.wait_for(self._batch_ready.wait(), self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_ready.clear()
+            batch = [entry for entry in self._pending[: self.max_batch_size] if not entry[1].done()]
+            del self._pending[: self.max_batch_size]
+            if not batch:
+                continue
+            batch.sort(key=lambda entry: (entry[0].system, entry[0].temperature, entry[0].max_tokens or 0))
+            self.batches += 1
+            self.batch_sizes.append(len(batch))
+            requests = [request for request, _ in batch]
+            try:
+                outputs = await loop.run_in_executor(self._executor, self.backend.generate_batch, requests)
+                if len(outputs) != len(batch):
+                    raise RuntimeError(f"Local backend returned {len(outputs)} outputs for {len(batch)} requests")
+            except Exception as exc:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for (_, future), output in zip(batch, outputs):
+                if not future.done():
+                    future.set_result(output)
+            if len(self._pending) >= self.max_batch_size:
+                self._batch_ready.set()
+
+
+def _group(requests: Sequence[LocalRequest]) -> List[Tuple[Tuple[str, float, Optional[int]], List[int]]]:
+    """Positions of requests sharing a system prompt and sampling parameters, in first-seen order."""
+
+    groups: "OrderedDict[Tuple[str, float, Optional[int]], List[int]]" = OrderedDict()
+    for index, request in enumerate(requests):
+        groups.setdefault((request.system, request.temperature, request.max_tokens), []).append(index)
+    return list(groups.items())
+
+
+class TransformersBackend:  # pragma: no cover - requires transformers and model weights
+    """Hugging Face ``transformers`` causal LM on CPU.
+
+    The chat template is split at the user message: the system-prompt prefix
+    is encoded once and its KV cache kept in a ``PrefixCache``; each batch
+    copies that cache, expands it to the batch size and only runs the forward
+    pass over the per-prompt suffixes.
+    """
+
+    def __init__(
+        self,
+        model_name_or_path: str,
+        *,
+        device: str = "cpu",
+        default_max_tokens: int = 256,
+        prefix_cache_size: int = 8,
+        threads: Optional[int] = None,
+    ) -> None:
+        torch = optional_module("torch")
+        transformers = optional_module("transformers")
+        if transformers is None or torch is None:
+            raise RuntimeError("transformers and torch are required for TransformersBackend")
+        self.torch = torch
+        if threads is not None:
+            torch.set_num_threads(threads)
+        self.model = model_name_or_path
+        self.device = device
+        self.default_max_tokens = default_max_tokens
+        self.tokenizer = transformers.AutoTokenizer.from_pretrained(model_name_or_path, padding_side="left")
+        if self.tokenizer.pad_token_id is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.lm = transformers.AutoModelForCausalLM.from_pretrained(model_name_or_path).to(device).eval()
+        self.prefix_cache: PrefixCache[Tuple[Any, Any]] = PrefixCache(prefix_cache_size)
+
+    def generate_batch(self, requests: Sequence[LocalRequest]) -> List[str]:
+        outputs: List[str] = [""] * len(requests)
+        for (system, temperature, max_tokens), positions in _group(requests):
+            prefix_ids, prefix_kv = self.prefix_cache.get_or_create(system, lambda: self._encode_prefix(system))
+            texts = self._generate_group(
+                prefix_ids, prefix_kv, [requests[i] for i in positions], temperature, max_tokens
+            )
+            for position, text in zip(positions, texts):
+                outputs[position] = text
+        return outputs
+
+    def _split_template(self, system: str, prompt: str) -> Tuple[str, str]:
+        marker = "\x00USER\x00"
+        if getattr(self.tokenizer, "chat_template", None):
+            rendered = self.tokenizer.apply_chat_template(
+                [{"role": "system", "content": system}, {"role": "user", "content": marker}],
+                tokenize=False,
+                add_generation_prompt=True,
+            )
+        else:
+            rendered = f"{system}\n\n{marker}\n"
+        prefix, suffix = rendered.split(marker, 1)
+        return prefix, prompt + suffix
+
+    def _encode_prefix(self, system: str) -> Tuple[Any, Any]:
+        prefix, _ = self._split_template(system, "")
+        ids = self.tokenizer(prefix, return_tensors="pt", add_special_tokens=False).input_ids.to(self.device)
+        with self.torch.no_grad():
+            kv = self.lm(ids, use_cache=True).past_key_values
+        return ids, kv
+
+    def _generate_group(
+        self,
+        prefix_ids: Any,
+        prefix_kv: Any,
+        requests: Sequence[LocalRequest],
+        temperature: float,
+        max_tokens: Optional[int],
+    ) -> List[str]:
+        suffixes = [self._split_template(request.system, request.prompt)[1] for request in requests]
+        encoded = self.tokenizer(suffixes, return_tensors="pt", padding=True, add_special_tokens=False).to(self.device)
+        size = len(requests)
+        input_ids = self.torch.cat([prefix_ids.expand(size, -1), encoded.input_ids], dim=1)
+        attention_mask = self.torch.cat(
+            [self.torch.ones_like(prefix_ids).expand(size, -1), encoded.attention_mask], dim=1
+        )
+        kv = copy.deepcopy(prefix_kv)
+        kv.batch_repeat_interleave(size)
+        sampling = {"do_sample": True, "temperature": temperature} if temperature > 0 else {"do_sample": False}
+        with self.torch.no_grad():
+            generated = self.lm.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                past_key_values=kv,
+                max_new_tokens=max_tokens or self.default_max_tokens,
+                pad_token_id=self.tokenizer.pad_token_id,
+                **sampling,
+            )
+        completions = generated[:, input_ids.shape[1] :]
+        return self.tokenizer.batch_decode(completions, skip_special_tokens=True)
+
+
+class LlamaCppBackend:  # pragma: no cover - requires llama-cpp-python and a GGUF model
+    """``llama.cpp`` GGUF model on CPU.
+
+    llama.cpp evaluates one sequence at a time, so a batch is processed in
+    order with prompts sharing a system prompt adjacent: the evaluated prefix
+    left in the context is then reused token-for-token, and a RAM state cache
+    restores it when a different system prompt intervenes.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        *,
+        n_ctx: int = 4096,
+        threads: Optional[int] = None,
+        default_max_tokens: int = 256,
+        cache_bytes: int = 2 << 30,
+    ) -> None:
+        llama_cpp = optional_module("llama_cpp")
+        if llama_cpp is None:
+            raise RuntimeError("llama-cpp-python is required for LlamaCppBackend")
+        self.model = model_path
+        self.default_max_tokens = default_max_tokens
+        self.llm = llama_cpp.Llama(model_path=model_path, n_ctx=n_ctx, n_threads=threads, verbose=False)
+        self.llm.set_cache(llama_cpp.LlamaRAMCache(capacity_bytes=cache_bytes))
+
+    def generate_batch(self, requests: Sequence[LocalRequest]) -> List[str]:
+        outputs: List[str] = [""] * len(requests)
+        for (_, temperature, max_tokens), positions in _group(requests):
+            for position in positions:
+                request = requests[position]
+                response = self.llm.create_chat_completion(
+                    messages=[
+                        {"role": "system", "content": request.system},
+                        {"role": "user", "content": request.prompt},
+                    ],
+                    temperature=temperature,
+                    max_tokens=max_tokens or self.default_max_tokens,
+                )
+                outputs[position] = response["choices"][0]["message"]["content"] or ""
+        return outputs
@@ -0,0 +1,162 @@
+"""Run manifests for incremental re-evaluation.
+
+A manifest records two fingerprints for every (strategy, scenario) unit of a
+run:
+
+``generation``
+    Everything that determines the model's responses: the model and sampling
+    settings, the strategy name and the exact prompts it built for the
+    scenario (so edits to scenario text or strategy parameters are caught).
+``scoring``
+    Everything that determines the score given the responses: the scenario's
+    target ranking and evaluation instructions, and ``SCORING_VERSION``.
+
+On a rerun, ``IncrementalRun`` compares the new fingerprints with the
+previous manifest. Units whose fingerprints both match reuse the previous
+result, units where only the scoring inputs changed are rescored from the
+stored responses, and everything else is regenerated.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+from .checkpoint import CheckpointKey
+from .config import ExperimentConfig, Scenario
+from .evaluation import SCORING_VERSION, AlignmentReport, AlignmentResult, score_conflict_response
+
+MANIFEST_VERSION = 1
+
+
+def _digest(payload: object) -> str:
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+@dataclass(frozen=True)
+class UnitFingerprint:
+    generation: str
+    scoring: str
+
+
+def fingerprint_unit(
+    config: ExperimentConfig, model: str, strategy: str, scenario: Scenario, prompt_pack: Mapping[str, str]
+) -> UnitFingerprint:
+    generation = _digest(
+        {
+            "model": model,
+            "temperature": config.temperature,
+            "max_tokens": config.max_tokens,
+            "samples": [
+                config.samples_per_scenario,
+                config.min_samples,
+                config.target_ci_half_width,
+                config.confidence,
+            ],
+            # Early-terminated streams keep only a prefix of the response.
+            "streaming": [config.stream_responses, config.early_termination],
+            "strategy": strategy,
+            "prompts": dict(prompt_pack),
+        }
+    )
+    scoring = _digest(
+        {
+            "version": SCORING_VERSION,
+            "target_ranking": list(scenario.target_ranking),
+            "evaluation_instructions": scenario.evaluation_instructions,
+        }
+    )
+    return UnitFingerprint(generation, scoring)
+
+
+@dataclass
+class RunManifest:
+    """Fingerprints of every unit of one run, keyed by (strategy, scenario_id)."""
+
+    units: Dict[CheckpointKey, UnitFingerprint] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path | str) -> "RunManifest":
+        data = json.loads(Path(path).read_text())
+        if data.get("version") != MANIFEST_VERSION:
+            # An unknown layout cannot be trusted; treat every unit as changed.
+            return cls()
+        units = {
+            (strategy, scenario_id): UnitFingerprint(entry["generation"], entry["scoring"])
+            for strategy, scenarios in data["units"].items()
+            for scenario_id, entry in scenarios.items()
+        }
+        return cls(units)
+
+    def save(self, path: Path | str) -> None:
+        nested: Dict[str, Dict[str, Dict[str, str]]] = {}
+        for (strategy, scenario_id), unit in self.units.items():
+            nested.setdefault(strategy, {})[scenario_id] = {"generation": unit.generation, "scoring": unit.scoring}
+        payload = {"version": MANIFEST_VERSION, "scoring_version": SCORING_VERSION, "units": nested}
+        Path(path).write_text(json.dumps(payload, indent=1, sort_keys=True))
+
+
+@dataclass
+class IncrementalRun:
+    """Previous manifest and report, plus the manifest being built for this run.
+
+    ``reuse`` is consulted by the runner for every unit before it is
+    scheduled and records its fingerprint for the new run; units the runner
+    fills in some other way (e.g. from a checkpoint journal) are added with
+    ``record``.
+    """
+
+    previous: RunManifest = field(default_factory=RunManifest)
+    previous_reports: Mapping[str, AlignmentReport] = field(default_factory=dict)
+    current: RunManifest = field(default_factory=RunManifest)
+    reused: int = 0
+    rescored: int = 0
+    regenerated: int = 0
+    _results: Dict[CheckpointKey, AlignmentResult] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        for strategy, report in self.previous_reports.items():
+            for result in report.results:
+                self._results[(strategy, result.scenario_id)] = result
+
+    @classmethod
+    def load(cls, manifest_path: Path | str, reports: Mapping[str, AlignmentReport]) -> "IncrementalRun":
+        path = Path(manifest_path)
+        previous = RunManifest.load(path) if path.exists() else RunManifest()
+        return cls(previous=previous, previous_reports=reports)
+
+    def record(self, strategy: str, scenario: Scenario, fingerprint: UnitFingerprint) -> None:
+        self.current.units[(strategy, scenario.identifier)] = fingerprint
+
+    def reuse(
+        self, strategy: str, scenario: Scenario, prompt_pack: Mapping[str, str], fingerprint: UnitFingerprint
+    ) -> Optional[AlignmentResult]:
+        """Return a result for an unchanged unit (rescoring it if needed), or ``None`` to regenerate."""
+
+        key = (strategy, scenario.identifier)
+        self.record(strategy, scenario, fingerprint)
+        old = self.previous.units.get(key)
+        result = self._results.get(key)
+        if old is None or result is None or old.generation != fingerprint.generation:
+            self.regenerated += 1
+            return None
+        if old.scoring == fingerprint.scoring:
+            self.reused += 1
+            return result
+        if result.sample_scores is not None:
+            # Only the first sample's responses are stored, so sampled units cannot be rescored.
+            self.regenerated += 1
+            return None
+        self.rescored += 1
+        notes = {k: v for k, v in result.notes.items() if k not in ("ranking_score", "honesty_bonus")}
+        notes.setdefault("system_prompt", prompt_pack["system"])
+        return score_conflict_response(
+            scenario,
+            stated_response=result.stated_preference,
+            conflict_response=result.conflict_response,
+            evaluation_notes=notes,
+        )
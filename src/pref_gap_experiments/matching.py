@@ -0,0 +1,71 @@
+"""Cached value-mention matching for scoring responses.
+
+``ValueMatcher.count`` does what the original per-call scan did (lowercase
+the response, then one substring check per value), with the values
+lowercased and deduplicated once per ``target_ranking`` instead of on every
+call. A single combined pass was measured and rejected: in CPython one regex
+alternation over the values ran 1.5-17x slower than the per-value ``in``
+checks, which run in C (slowest when a value is absent and the whole
+response must be scanned).
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Sequence, Tuple
+
+
+class ValueMatcher:
+    """Counts case-insensitive substring mentions of several values."""
+
+    def __init__(self, values: Sequence[str]) -> None:
+        self.values = tuple(values)
+        self._slots: Tuple[str, ...] = tuple(value.lower() for value in self.values)
+        self._unique: Tuple[str, ...] = tuple(dict.fromkeys(self._slots))
+
+    def count(self, response: str) -> int:
+        lowered = response.lower()
+        if len(self._unique) == len(self._slots):
+            return sum(1 for value in self._unique if value in lowered)
+        found = {value for value in self._unique if value in lowered}
+        return sum(1 for value in self._slots if value in found)
+
+
+class MentionTracker:
+    """Incrementally tracks which values a streamed response has mentioned (substring matching).
+
+    Each chunk is lowercased once and only the new text (plus an overlap of
+    the longest value, so mentions split across chunks are found) is searched
+    for values not yet seen. ``complete`` turns true once every value has been
+    mentioned, after which further text cannot change the mention count.
+    """
+
+    def __init__(self, matcher: ValueMatcher) -> None:
+        self._remaining = set(matcher._unique)
+        self._overlap = max((len(value) for value in self._remaining), default=1) - 1
+        self._tail = ""
+
+    @property
+    def complete(self) -> bool:
+        return not self._remaining
+
+    def feed(self, chunk: str) -> bool:
+        """Add ``chunk`` to the response; return ``complete``."""
+
+        if not self._remaining:
+            return True
+        window = self._tail + chunk.lower()
+        self._remaining = {value for value in self._remaining if value not in window}
+        self._tail = window[-self._overlap :] if self._overlap > 0 else ""
+        return not self._remaining
+
+
+@lru_cache(maxsize=4096)
+def _compiled(values: Tuple[str, ...]) -> ValueMatcher:
+    return ValueMatcher(values)
+
+
+def matcher_for(values: Sequence[str]) -> ValueMatcher:
+    """Return a cached matcher for ``values`` (typically a scenario's ``target_ranking``)."""
+
+    return _compiled(tuple(values))
@@ -0,0 +1,168 @@
+"""Ranking comparison metrics.
+
+Kendall tau distances are computed by counting inversions with a merge sort,
+which is O(n log n) per ranking. ``alignment_scores`` scores many model
+rankings against one target at once and uses NumPy when it is installed.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Hashable, List, Sequence, Tuple
+
+from ._optional import optional_module
+
+
+def _first_positions(ranking: Sequence[Hashable]) -> Dict[Hashable, int]:
+    positions: Dict[Hashable, int] = {}
+    for index, item in enumerate(ranking):
+        positions.setdefault(item, index)
+    return positions
+
+
+def _paired_positions(target: Sequence[Hashable], model: Sequence[Hashable]) -> List[Tuple[int, int]]:
+    """Return ``(target position, model position)`` for each target entry.
+
+    Positions are first occurrences, mirroring ``list.index``; a target item
+    missing from ``model`` raises ``ValueError`` just like ``list.index``.
+    """
+
+    target_positions = _first_positions(target)
+    model_positions = _first_positions(model)
+    pairs = []
+    for item in target:
+        if item not in model_positions:
+            raise ValueError(f"{item!r} is not in list")
+        pairs.append((target_positions[item], model_positions[item]))
+    return pairs
+
+
+def _count_inversions(values: List[int]) -> int:
+    """Count pairs ``i < j`` with ``values[i] > values[j]`` using a bottom-up merge sort."""
+
+    inversions = 0
+    width = 1
+    current = list(values)
+    size = len(current)
+    while width < size:
+        merged: List[int] = []
+        for start in range(0, size, 2 * width):
+            left = current[start : start + width]
+            right = current[start + width : start + 2 * width]
+            i = j = 0
+            while i < len(left) and j < len(right):
+                if left[i] <= right[j]:
+                    merged.append(left[i])
+                    i += 1
+                else:
+                    merged.append(right[j])
+                    inversions += len(left) - i
+                    j += 1
+            merged.extend(left[i:])
+            merged.extend(right[j:])
+        current = merged
+        width *= 2
+    return inversions
+
+
+def _discordant_pairs(pairs: List[Tuple[int, int]]) -> int:
+    # Sorting by (target, model) leaves tied target positions in model order, so
+    # only strictly discordant pairs show up as inversions.
+    return _count_inversions([model for _, model in sorted(pairs)])
+
+
+def kendall_tau_distance(target: Sequence[Hashable], model: Sequence[Hashable]) -> int:
+    """Number of item pairs ordered differently by ``target`` and ``model``."""
+
+    if len(target) != len(model):
+        raise ValueError("Rankings must have the same length")
+    if len(target) < 2:
+        return 0
+    return _discordant_pairs(_paired_positions(target, model))
+
+
+def kendall_tau_score(target: Sequence[Hashable], model: Sequence[Hashable]) -> float:
+    """Inverted normalized Kendall tau distance: 1.0 is identical, 0.0 is reversed."""
+
+    total_pairs = len(target) * (len(target) - 1) // 2
+    distance = kendall_tau_distance(target, model)
+    if total_pairs == 0:
+        return 1.0
+    return 1.0 - distance / total_pairs
+
+
+def top_k_kendall_tau_score(target: Sequence[Hashable], model: Sequence[Hashable], k: int) -> float:
+    """Kendall tau score restricted to pairs involving at least one of the target's top ``k`` items."""
+
+    if len(target) != len(model):
+        raise ValueError("Rankings must have the same length")
+    n = len(target)
+    k = max(0, min(k, n))
+    tail = n - k
+    relevant_pairs = n * (n - 1) // 2 - tail * (tail - 1) // 2
+    if relevant_pairs == 0:
+        return 1.0
+    pairs = _paired_positions(target, model)
+    tail_pairs = [pair for pair in pairs if pair[0] >= k]
+    distance = _discordant_pairs(pairs) - _discordant_pairs(tail_pairs)
+    return 1.0 - distance / relevant_pairs
+
+
+def footrule_distance(target: Sequence[Hashable], model: Sequence[Hashable]) -> int:
+    """Spearman footrule: total displacement of each item between the rankings."""
+
+    if len(target) != len(model):
+        raise ValueError("Rankings must have the same length")
+    return sum(abs(target_pos - model_pos) for target_pos, model_pos in _paired_positions(target, model))
+
+
+def footrule_score(target: Sequence[Hashable], model: Sequence[Hashable]) -> float:
+    """Footrule distance normalized by its maximum (``floor(n**2 / 2)``) and inverted."""
+
+    maximum = len(target) ** 2 // 2
+    distance = footrule_distance(target, model)
+    if maximum == 0:
+        return 1.0
+    return 1.0 - distance / maximum
+
+
+def top_k_footrule_score(target: Sequence[Hashable], model: Sequence[Hashable], k: int) -> float:
+    """Footrule over the target's top ``k`` items, with positions beyond ``k`` clamped to ``k``."""
+
+    if len(target) != len(model):
+        raise ValueError("Rankings must have the same length")
+    k = max(0, min(k, len(target)))
+    model_positions = _first_positions(model)
+    distance = 0
+    for target_pos, item in enumerate(target[:k]):
+        distance += abs(target_pos - min(model_positions.get(item, k), k))
+    # Normalize by the largest displacement each item could have on its own.
+    maximum = sum(max(target_pos, k - target_pos) for target_pos in range(k))
+    if maximum == 0:
+        return 1.0
+    return 1.0 - distance / maximum
+
+
+def alignment_scores(target: Sequence[Hashable], rankings: Sequence[Sequence[Hashable]]) -> List[float]:
+    """Kendall tau score of each ranking in ``rankings`` against ``target``.
+
+    With NumPy available all rankings are compared in one vectorized pass;
+    otherwise each ranking is scored with ``kendall_tau_score``.
+    """
+
+    np = optional_module("numpy")
+    if np is None or not rankings:
+        return [kendall_tau_score(target, ranking) for ranking in rankings]
+    n = len(target)
+    total_pairs = n * (n - 1) // 2
+    if any(len(ranking) != n for ranking in rankings):
+        raise ValueError("Rankings must have the same length")
+    if total_pairs == 0:
+        return [1.0] * len(rankings)
+    positions = np.array([[model for _, model in _paired_positions(target, ranking)] for ranking in rankings])
+    target_positions = np.array([target_pos for target_pos, _ in _paired_positions(target, target)])
+    upper = np.triu(np.ones((n, n), dtype=bool), k=1)
+    target_order = np.sign(target_positions[:, None] - target_positions[None, :])
+    model_order = np.sign(positions[:, :, None] - positions[:, None, :])
+    discordant = ((target_order[None, :, :] * model_order) < 0) & upper
+    distances = discordant.sum(axis=(1, 2))
+    return (1.0 - distances / total_pairs).tolist()
@@ -0,0 +1,193 @@
+"""Rate limiting, retry and adaptive concurrency helpers for remote LLM clients."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 429, 500, 502, 503, 504})
+_RETRYABLE_ERROR_NAMES = frozenset({"APIConnectionError", "APITimeoutError", "RateLimitError", "InternalServerError"})
+
+
+def is_throttle(exc: BaseException) -> bool:
+    """Return whether ``exc`` signals that the provider is rate limiting us."""
+
+    return getattr(exc, "status_code", None) == 429 or type(exc).__name__ == "RateLimitError"
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Return whether ``exc`` is a transient failure worth retrying."""
+
+    if getattr(exc, "status_code", None) in RETRYABLE_STATUS_CODES:
+        return True
+    return any(cls.__name__ in _RETRYABLE_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+def retry_after_seconds(exc: BaseException) -> Optional[float]:
+    """Extract a ``Retry-After`` hint (in seconds) from an API error, if present."""
+
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or getattr(exc, "headers", None) or {}
+    for header in ("retry-after-ms", "retry-after"):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            continue
+        return seconds / 1000.0 if header == "retry-after-ms" else seconds
+    return None
+
+
+def estimate_tokens(*texts: str, max_tokens: Optional[int] = None) -> int:
+    """Cheap upper-bound token estimate used to reserve tokens-per-minute budget."""
+
+    prompt_tokens = sum(len(text) for text in texts) // 4 + 1
+    return prompt_tokens + (max_tokens or 0)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate_per_minute``."""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until ``amount`` tokens are available and consume them.
+
+        Returns the number of seconds spent waiting. Requests larger than the
+        bucket capacity are clamped so they can still proceed.
+        """
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate_per_second
+                await self._sleep(delay)
+                waited += delay
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+
+@dataclass
+class RateLimiter:
+    """Combines request-per-minute and token-per-minute buckets."""
+
+    requests_per_minute: Optional[float] = None
+    tokens_per_minute: Optional[float] = None
+    _requests: Optional[TokenBucket] = field(default=None, init=False, repr=False)
+    _tokens: Optional[TokenBucket] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.requests_per_minute:
+            self._requests = TokenBucket(self.requests_per_minute)
+        if self.tokens_per_minute:
+            self._tokens = TokenBucket(self.tokens_per_minute)
+
+    async def acquire(self, tokens: int) -> float:
+        waited = 0.0
+        if self._requests is not None:
+            waited += await self._requests.acquire(1)
+        if self._tokens is not None:
+            waited += await self._tokens.acquire(tokens)
+        return waited
+
+
+@dataclass
+class RetryPolicy:
+    """Jittered exponential backoff that honours provider ``Retry-After`` hints."""
+
+    max_attempts: int = 6
+    base_delay: float = 0.5
+    max_delay: float = 60.0
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Return how long to wait before retry number ``attempt`` (zero based)."""
+
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        jittered = self.rng.uniform(ceiling / 2, ceiling)
+        if retry_after is not None:
+            return max(retry_after, jittered)
+        return jittered
+
+
+class AIMDController:
+    """Additive-increase / multiplicative-decrease concurrency limit.
+
+    The limit grows by ``increase`` after each window of ``limit`` successful
+    calls and is multiplied by ``decrease`` whenever a call is throttled, so
+    effective concurrency converges on what the provider tolerates.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        *,
+        minimum: int = 1,
+        maximum: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(min(max(initial, minimum), maximum))
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+
+    async def release(self, *, throttled: bool = False) -> None:
+        if throttled:
+            self._limit = max(float(self.minimum), self._limit * self.decrease)
+        else:
+            self._limit = min(float(self.maximum), self._limit + self.increase / max(1.0, self._limit))
+        self._in_flight -= 1
+        if self._condition is None:
+            return
+        async with self._condition:
+            self._condition.notify_all()
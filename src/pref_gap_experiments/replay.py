@@ -0,0 +1,337 @@
+"""Record and replay LLM traffic.
+
+``RecordingLLMClient`` wraps any client and appends every exchange (request
+parameters, response, latency, token usage) to a ``TrafficArchive``.
+``ReplayLLMClient`` later serves those responses offline, optionally
+sleeping for the recorded latencies so benchmarks see realistic timing.
+
+An archive is a directory with two append-only files:
+
+``traffic.jsonl``
+    One JSON record per exchange.
+``traffic.idx``
+    Fixed-size binary entries (``sha256`` of the request key, byte offset and
+    length of the record in ``traffic.jsonl``).
+
+Opening an archive reads only the index; records are read on demand from a
+memory map of the data file, so archives much larger than memory can be
+replayed. Requests recorded several times (e.g. repeated samples at a
+non-zero temperature) are replayed in recorded order, cycling when exhausted.
+
+Streams the caller closed early (e.g. by the runner's early termination) are
+recorded with the text consumed so far and ``"truncated": true``. Replaying
+such a record as a stream serves that text and raises ``ReplayMissError``
+only if the caller reads past its end; ``generate`` never serves it.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import mmap
+import re
+import struct
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from .coalescing import request_key
+from .llm import LLMClient
+from .telemetry import record_usage, track_usage
+
+DATA_FILE = "traffic.jsonl"
+INDEX_FILE = "traffic.idx"
+_ENTRY = struct.Struct("<32sQI")
+
+
+class ReplayMissError(KeyError):
+    """Raised when a replayed request was never recorded."""
+
+
+class TrafficArchive:
+    """Append-only archive of LLM exchanges with a hash index."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._data_path = self.path / DATA_FILE
+        self._index_path = self.path / INDEX_FILE
+        self._data_path.touch()
+        self._offsets: Dict[bytes, List[Tuple[int, int]]] = {}
+        self._load_index()
+        self._data = self._data_path.open("ab")
+        self._index = self._index_path.open("ab")
+        self._map: Optional[mmap.mmap] = None
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append one exchange; ``record["key"]`` must be its ``request_key``."""
+
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        offset = self._data.tell()
+        self._data.write(line)
+        self._data.flush()
+        digest = bytes.fromhex(record["key"])
+        self._index.write(_ENTRY.pack(digest, offset, len(line)))
+        self._index.flush()
+        self._offsets.setdefault(digest, []).append((offset, len(line)))
+
+    def records(self, key: str) -> List[Dict[str, Any]]:
+        """All records stored under ``key``, in recording order."""
+
+        return [self._read(offset, length) for offset, length in self._offsets.get(bytes.fromhex(key), ())]
+
+    def count(self, key: str) -> int:
+        return len(self._offsets.get(bytes.fromhex(key), ()))
+
+    def read(self, key: str, occurrence: int = 0) -> Optional[Dict[str, Any]]:
+        entries = self._offsets.get(bytes.fromhex(key))
+        if not entries:
+            return None
+        offset, length = entries[occurrence % len(entries)]
+        return self._read(offset, length)
+
+    def __contains__(self, key: str) -> bool:
+        return bytes.fromhex(key) in self._offsets
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._offsets.values())
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for entries in self._offsets.values():
+            for offset, length in entries:
+                yield self._read(offset, length)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._data.close()
+        self._index.close()
+
+    def _read(self, offset: int, length: int) -> Dict[str, Any]:
+        if self._map is None or offset + length > len(self._map):
+            # Remap after appends grew the file past the current mapping.
+            if self._map is not None:
+                self._map.close()
+            with self._data_path.open("rb") as handle:
+                self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return json.loads(self._map[offset : offset + length])
+
+    def _load_index(self) -> None:
+        data_size = self._data_path.stat().st_size
+        if self._index_path.exists():
+            raw = self._index_path.read_bytes()
+            usable = len(raw) - len(raw) % _ENTRY.size
+            entries = list(_ENTRY.iter_unpack(raw[:usable]))
+            covered = entries[-1][1] + entries[-1][2] if entries else 0
+            if usable == len(raw) and covered == data_size:
+                for digest, offset, length in entries:
+                    self._offsets.setdefault(digest, []).append((offset, length))
+                return
+        self._rebuild_index()
+
+    def _rebuild_index(self) -> None:
+        """Recreate the index from the data file, dropping a torn final record."""
+
+        entries = bytearray()
+        valid_end = 0
+        with self._data_path.open("rb") as handle:
+            offset = 0
+            for line in handle:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    key = json.loads(line)["key"]
+                except (ValueError, KeyError):
+                    break
+                digest = bytes.fromhex(key)
+                entries += _ENTRY.pack(digest, offset, len(line))
+                self._offsets.setdefault(digest, []).append((offset, len(line)))
+                offset += len(line)
+                valid_end = offset
+        with self._data_path.open("r+b") as handle:
+            handle.truncate(valid_end)
+        self._index_path.write_bytes(bytes(entries))
+
+
+def _exchange_key(model: str, system: str, prompt: str, temperature: float, max_tokens: Optional[int]) -> str:
+    return request_key(model=model, system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens)
+
+
+class RecordingLLMClient(LLMClient):
+    """Passes calls through to ``client`` and archives every successful exchange."""
+
+    def __init__(self, client: LLMClient, archive: TrafficArchive) -> None:
+        self.client = client
+        self.model = client.model
+        self.archive = archive
+
+    async def generate(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> str:
+        started = time.perf_counter()
+        with track_usage() as usage:
+            response = await self.client.generate(
+                system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens
+            )
+        self._record(
+            system, prompt, temperature, max_tokens, response, time.perf_counter() - started, None, usage, False
+        )
+        return response
+
+    async def stream(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> AsyncIterator[str]:
+        started = time.perf_counter()
+        first_token: Optional[float] = None
+        chunks: List[str] = []
+        finished = False
+        stopped = False
+        with track_usage() as usage:
+            stream = self.client.stream(system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens)
+            try:
+                async for chunk in stream:
+                    if first_token is None:
+                        first_token = time.perf_counter() - started
+                    chunks.append(chunk)
+                    yield chunk
+                finished = True
+            except GeneratorExit:
+                # The caller closed the stream early; keep what it consumed, marked as truncated.
+                stopped = True
+                raise
+            finally:
+                await stream.aclose()
+                if finished or stopped:
+                    elapsed = time.perf_counter() - started
+                    self._record(
+                        system, prompt, temperature, max_tokens, "".join(chunks), elapsed, first_token, usage, stopped
+                    )
+
+    def _record(
+        self,
+        system: str,
+        prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        response: str,
+        latency: float,
+        first_token: Optional[float],
+        usage: Any,
+        truncated: bool,
+    ) -> None:
+        self.archive.append(
+            {
+                "key": _exchange_key(self.model, system, prompt, temperature, max_tokens),
+                "model": self.model,
+                "system": system,
+                "prompt": prompt,
+                "temperature": temperature,
+                "max_tokens": max_tokens,
+                "response": response,
+                "latency": latency,
+                "first_token": first_token,
+                "truncated": truncated,
+                "usage": {
+                    "prompt_tokens": usage.prompt_tokens,
+                    "completion_tokens": usage.completion_tokens,
+                    "cached_tokens": usage.cached_tokens,
+                },
+                "recorded_at": time.time(),
+            }
+        )
+
+
+class ReplayLLMClient(LLMClient):
+    """Serves recorded responses from a ``TrafficArchive``.
+
+    With ``reproduce_latency`` each call sleeps for its recorded latency
+    multiplied by ``latency_scale`` (streams wait the recorded time to first
+    token, then spread the remainder over their chunks). Unrecorded requests
+    raise ``ReplayMissError`` unless a ``fallback`` client is given.
+    """
+
+    def __init__(
+        self,
+        archive: TrafficArchive,
+        model: str,
+        *,
+        reproduce_latency: bool = False,
+        latency_scale: float = 1.0,
+        fallback: LLMClient | None = None,
+    ) -> None:
+        self.archive = archive
+        self.model = model
+        self.reproduce_latency = reproduce_latency
+        self.latency_scale = latency_scale
+        self.fallback = fallback
+        self.hits = 0
+        self.misses = 0
+        self._served: Dict[str, int] = {}
+
+    async def generate(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> str:
+        record = self._lookup(system, prompt, temperature, max_tokens, complete=True)
+        if record is None:
+            assert self.fallback is not None
+            return await self.fallback.generate(
+                system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens
+            )
+        if self.reproduce_latency:
+            await asyncio.sleep(record["latency"] * self.latency_scale)
+        self._report_usage(record)
+        return record["response"]
+
+    async def stream(
+        self, *, system: str, prompt: str, temperature: float, max_tokens: Optional[int]
+    ) -> AsyncIterator[str]:
+        record = self._lookup(system, prompt, temperature, max_tokens)
+        if record is None:
+            assert self.fallback is not None
+            async for chunk in self.fallback.stream(
+                system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens
+            ):
+                yield chunk
+            return
+        chunks = re.findall(r"\s*\S+\s*", record["response"]) or [record["response"]]
+        first_token = record.get("first_token")
+        if first_token is None:
+            first_token = record["latency"]
+        per_chunk = max(0.0, record["latency"] - first_token) / max(1, len(chunks) - 1)
+        for position, chunk in enumerate(chunks):
+            if self.reproduce_latency:
+                await asyncio.sleep((first_token if position == 0 else per_chunk) * self.latency_scale)
+            yield chunk
+        self._report_usage(record)
+        if record.get("truncated"):
+            raise ReplayMissError(
+                f"Recorded stream for request {record['key'][:12]} was closed early; the caller read past its end"
+            )
+
+    def _lookup(
+        self, system: str, prompt: str, temperature: float, max_tokens: Optional[int], *, complete: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        key = self._key(system, prompt, temperature, max_tokens)
+        occurrence = self._served.get(key, 0)
+        record = self.archive.read(key, occurrence)
+        if record is not None and complete and record.get("truncated"):
+            # A truncated stream is not a full response; only streams may replay it.
+            record = None
+        if record is None:
+            self.misses += 1
+            if self.fallback is None:
+                raise ReplayMissError(f"No recorded response for request {key[:12]} ({prompt[:60]!r})")
+            return None
+        self._served[key] = occurrence + 1
+        self.hits += 1
+        return record
+
+    def _key(self, system: str, prompt: str, temperature: float, max_tokens: Optional[int]) -> str:
+        return _exchange_key(self.model, system, prompt, temperature, max_tokens)
+
+    @staticmethod
+    def _report_usage(record: Dict[str, Any]) -> None:
+        usage = record.get("usage") or {}
+        if usage.get("prompt_tokens"):
+            record_usage(usage["prompt_tokens"], usage.get("completion_tokens", 0), usage.get("cached_tokens", 0))
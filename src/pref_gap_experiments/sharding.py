@@ -0,0 +1,116 @@
+"""Sharded, multi-process execution of experiment runs.
+
+Scenarios are split into ``n`` shards by file position (see
+``StreamingScenarioDataset``). Each shard can be run in a local worker process
+via ``run_sharded`` or as an independent ``run_experiments.py --shard i/n``
+invocation on another machine; ``merge_shard_reports`` then combines the
+partial reports into one report per strategy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+from ._optional import optional_module
+from .columnar import is_columnar, read_columnar
+from .config import ExperimentConfig
+from .datasets import ScenarioDataset
+from .evaluation import AlignmentReport, AlignmentResult
+from .experiments import ExperimentRunner
+from .llm import LLMClient
+
+
+@dataclass(frozen=True)
+class ShardJob:
+    """Everything a worker process needs to run one shard.
+
+    ``config.scenarios`` is ignored; the worker streams its own shard of
+    ``dataset``. ``client_factory`` must be picklable (e.g. a module-level
+    function or ``functools.partial`` of one).
+    """
+
+    dataset: Path
+    shard_index: int
+    shard_count: int
+    config: ExperimentConfig
+    client_factory: Callable[[], LLMClient]
+
+
+def run_shard(job: ShardJob) -> Dict[str, Dict[str, Any]]:
+    """Run one shard to completion and return its serialized reports."""
+
+    scenarios = ScenarioDataset.stream(job.dataset, shard=(job.shard_index, job.shard_count))
+    config = replace(job.config, scenarios=scenarios)
+    runner = ExperimentRunner(config=config, client=job.client_factory())
+    reports = asyncio.run(runner.run())
+    return {name: report.to_dict() for name, report in reports.items()}
+
+
+def run_sharded(
+    dataset: Path | str,
+    config: ExperimentConfig,
+    client_factory: Callable[[], LLMClient],
+    shard_count: int,
+    *,
+    executor: Optional[Executor] = None,
+) -> Dict[str, AlignmentReport]:
+    """Run ``shard_count`` shards in parallel worker processes and merge the results."""
+
+    template = replace(config, scenarios=[])
+    jobs = [ShardJob(Path(dataset), index, shard_count, template, client_factory) for index in range(shard_count)]
+    pool = executor if executor is not None else ProcessPoolExecutor(max_workers=shard_count)
+    partials: Dict[int, Dict[str, AlignmentReport]] = {}
+    try:
+        futures = {pool.submit(run_shard, job): job.shard_index for job in jobs}
+        for future in as_completed(futures):
+            partials[futures[future]] = {
+                name: AlignmentReport.from_dict(data) for name, data in future.result().items()
+            }
+    finally:
+        if executor is None:
+            pool.shutdown()
+    return merge_shard_reports(partials)
+
+
+def merge_shard_reports(partials: Mapping[int, Mapping[str, AlignmentReport]]) -> Dict[str, AlignmentReport]:
+    """Combine per-shard reports, keyed by shard index, into one report per strategy.
+
+    Results are interleaved by (position within shard, shard index), which
+    reproduces the dataset's original order when shards were taken by
+    position, and does not depend on the order in which shards finished.
+    Averages are recomputed over all merged results.
+    """
+
+    names: List[str] = []
+    ordered: Dict[str, List[Tuple[int, int, AlignmentResult]]] = {}
+    for shard_index in sorted(partials):
+        for name, report in partials[shard_index].items():
+            if name not in ordered:
+                names.append(name)
+                ordered[name] = []
+            ordered[name].extend((local, shard_index, result) for local, result in enumerate(report.results))
+    return {
+        name: AlignmentReport([result for _, _, result in sorted(ordered[name], key=lambda entry: entry[:2])])
+        for name in names
+    }
+
+
+def load_reports(path: Path | str) -> Dict[str, AlignmentReport]:
+    """Load a serialized ``{strategy: report}`` mapping from JSON, YAML or a columnar store."""
+
+    if is_columnar(path):
+        return read_columnar(path)
+    path = Path(path)
+    text = path.read_text()
+    yaml = optional_module("yaml") if path.suffix != ".json" else None
+    if yaml is not None:
+        # YAML is a superset of JSON, so this handles both formats.
+        loaded = yaml.safe_load(text)
+    else:
+        loaded = json.loads(text)
+    return {name: AlignmentReport.from_dict(data) for name, data in loaded.items()}
@@ -0,0 +1,50 @@
+"""Incremental result sinks that receive alignment results as they complete."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Protocol, TextIO
+
+from .evaluation import AlignmentResult
+
+
+class ResultSink(Protocol):
+    """Receives each ``AlignmentResult`` as soon as it has been scored."""
+
+    def write(self, strategy: str, index: int, result: AlignmentResult) -> None:
+        """Handle the result for scenario ``index`` of ``strategy``."""
+
+    def close(self) -> None:
+        """Release any resources held by the sink."""
+
+
+@dataclass
+class CallbackSink:
+    """Forwards results to an arbitrary callable."""
+
+    callback: Callable[[str, int, AlignmentResult], None]
+
+    def write(self, strategy: str, index: int, result: AlignmentResult) -> None:
+        self.callback(strategy, index, result)
+
+    def close(self) -> None:
+        pass
+
+
+class JSONLResultSink:
+    """Appends one JSON object per result to a file, flushing after every line."""
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle: TextIO = self.path.open("a", encoding="utf-8")
+
+    def write(self, strategy: str, index: int, result: AlignmentResult) -> None:
+        record = {"strategy": strategy, "index": index, **result.to_dict()}
+        self._handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
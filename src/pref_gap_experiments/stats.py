@@ -0,0 +1,69 @@
+"""Summary statistics for alignment scores.
+
+Uses NumPy for vectorized means, variances and bootstrap resampling when it
+is installed, and falls back to pure Python otherwise.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from statistics import NormalDist
+from typing import Sequence, Tuple
+
+from ._optional import optional_module
+
+# Upper bound on resampled values drawn at once by ``bootstrap_interval``.
+BOOTSTRAP_CHUNK = 1 << 20
+
+
+def mean_and_variance(values: Sequence[float]) -> Tuple[float, float]:
+    """Return the mean and unbiased sample variance (0.0 for fewer than two values)."""
+
+    if len(values) == 0:
+        return 0.0, 0.0
+    np = optional_module("numpy")
+    if np is not None:
+        array = np.asarray(values, dtype=float)
+        variance = float(array.var(ddof=1)) if array.size > 1 else 0.0
+        return float(array.mean()), variance
+    mean = sum(values) / len(values)
+    if len(values) < 2:
+        return mean, 0.0
+    return mean, sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+
+def normal_half_width(values: Sequence[float], confidence: float = 0.95) -> float:
+    """Half-width of the normal-approximation confidence interval for the mean."""
+
+    if len(values) < 2:
+        return math.inf
+    _, variance = mean_and_variance(values)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    return z * math.sqrt(variance / len(values))
+
+
+def bootstrap_interval(
+    values: Sequence[float], confidence: float = 0.95, resamples: int = 2000, seed: int = 0
+) -> Tuple[float, float]:
+    """Percentile bootstrap confidence interval for the mean of ``values``."""
+
+    if len(values) == 0:
+        return 0.0, 0.0
+    alpha = (1 - confidence) / 2
+    np = optional_module("numpy")
+    if np is not None:
+        array = np.asarray(values, dtype=float)
+        rng = np.random.default_rng(seed)
+        means = np.empty(resamples)
+        # Resample in chunks so the index matrix stays around BOOTSTRAP_CHUNK entries for large reports.
+        rows = max(1, BOOTSTRAP_CHUNK // array.size)
+        for start in range(0, resamples, rows):
+            count = min(rows, resamples - start)
+            means[start : start + count] = array[rng.integers(0, array.size, size=(count, array.size))].mean(axis=1)
+        low, high = np.quantile(means, [alpha, 1 - alpha])
+        return float(low), float(high)
+    rng_py = random.Random(seed)
+    size = len(values)
+    means = sorted(sum(rng_py.choices(values, k=size)) / size for _ in range(resamples))
+    return means[int(alpha * (resamples - 1))], means[int((1 - alpha) * (resamples - 1))]
@@ -0,0 +1,284 @@
+"""Lightweight instrumentation for experiment runs.
+
+``Telemetry`` records timed spans (LLM calls, semaphore waits, scoring,
+serialization) and summarises them as latency percentiles and throughput.
+Finished spans are folded into running per-name statistics, and only the
+most recent ones are kept for export as a Chrome trace (``chrome://tracing``
+/ Perfetto), so memory stays bounded however long the run. Spans can also be
+forwarded to pluggable hooks. Clients annotate the span of the call they
+are serving through ``annotate`` without holding a reference to the recorder.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import math
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("pref_gap_span", default=None)
+_current_usage: contextvars.ContextVar[Optional["TokenUsage"]] = contextvars.ContextVar(
+    "pref_gap_usage", default=None
+)
+
+# Durations kept per span name for percentiles; past this, a uniform reservoir sample of them.
+DURATION_SAMPLES = 10_000
+# Most recent finished spans kept for the Chrome trace.
+TRACE_SPANS = 100_000
+
+
+@dataclass
+class Span:
+    """A single timed operation."""
+
+    name: str
+    start: float
+    track: int
+    end: Optional[float] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else self.start) - self.start
+
+
+@dataclass
+class _SpanStats:
+    """Running statistics of the spans sharing one name."""
+
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    samples: List[float] = field(default_factory=list)
+
+    def add(self, duration: float, rng: random.Random) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        if len(self.samples) < DURATION_SAMPLES:
+            self.samples.append(duration)
+        else:
+            slot = rng.randrange(self.count)
+            if slot < DURATION_SAMPLES:
+                self.samples[slot] = duration
+
+
+@dataclass
+class SpanSummary:
+    count: int
+    total: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+    per_second: float
+
+
+def annotate(**attributes: Any) -> None:
+    """Attach attributes (token counts, retries, ...) to the innermost active span, if any."""
+
+    span = _current_span.get()
+    if span is not None:
+        for key, value in attributes.items():
+            if isinstance(value, (int, float)) and isinstance(span.attributes.get(key), (int, float)):
+                span.attributes[key] += value
+            else:
+                span.attributes[key] = value
+
+
+@dataclass
+class TokenUsage:
+    """Token counts reported by the provider for the calls made inside ``track_usage``.
+
+    ``cached_tokens`` is the part of ``prompt_tokens`` served from the
+    provider's prompt cache.
+    """
+
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    def as_notes(self) -> Dict[str, str]:
+        return {
+            "prompt_tokens": str(self.prompt_tokens),
+            "cached_tokens": str(self.cached_tokens),
+            "completion_tokens": str(self.completion_tokens),
+        }
+
+
+@contextmanager
+def track_usage() -> Iterator[TokenUsage]:
+    """Collect the token usage of every call made in this context, including tasks it spawns.
+
+    Blocks nest: on exit, the totals are also added to the enclosing block.
+    """
+
+    usage = TokenUsage()
+    token = _current_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _current_usage.reset(token)
+        outer = _current_usage.get()
+        if outer is not None:
+            outer.prompt_tokens += usage.prompt_tokens
+            outer.completion_tokens += usage.completion_tokens
+            outer.cached_tokens += usage.cached_tokens
+
+
+def record_usage(prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> None:
+    """Report provider token usage to the active span and ``track_usage`` block, if any."""
+
+    annotate(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, cached_tokens=cached_tokens)
+    usage = _current_usage.get()
+    if usage is not None:
+        usage.prompt_tokens += prompt_tokens
+        usage.completion_tokens += completion_tokens
+        usage.cached_tokens += cached_tokens
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Telemetry:
+    """Collects spans for one run.
+
+    ``spans`` holds the last ``max_spans`` finished spans; summaries and
+    ``totals`` cover every span.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.perf_counter, max_spans: int = TRACE_SPANS) -> None:
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.hooks: List[Callable[[Span], None]] = []
+        self._stats: Dict[str, _SpanStats] = {}
+        self._totals: Dict[str, float] = {}
+        self._rng = random.Random(0)
+        self._clock = clock
+        self._tracks: Dict[int, int] = {}
+        self.started = clock()
+        self.finished: Optional[float] = None
+
+    def add_hook(self, hook: Callable[[Span], None]) -> None:
+        """Call ``hook`` with every span as soon as it ends."""
+
+        self.hooks.append(hook)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        span = Span(name=name, start=self._clock(), track=self._track(), attributes=dict(attributes))
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            _current_span.reset(token)
+            span.end = self._clock()
+            self._finish(span)
+
+    def now(self) -> float:
+        return self._clock()
+
+    def record(self, name: str, start: float, **attributes: Any) -> Span:
+        """Record a span that began at ``start`` (from ``now()``) and ends now."""
+
+        span = Span(name=name, start=start, track=self._track(), end=self._clock(), attributes=dict(attributes))
+        self._finish(span)
+        return span
+
+    def start(self) -> None:
+        """Mark the beginning of the measured run (defaults to construction time)."""
+
+        self.started = self._clock()
+        self.finished = None
+
+    def finish(self) -> None:
+        self.finished = self._clock()
+
+    @property
+    def wall_time(self) -> float:
+        end = self.finished if self.finished is not None else self._clock()
+        return end - self.started
+
+    def summary(self) -> Dict[str, SpanSummary]:
+        wall = self.wall_time or 1e-9
+        summary = {}
+        for name, stats in sorted(self._stats.items()):
+            ordered = sorted(stats.samples)
+            summary[name] = SpanSummary(
+                count=stats.count,
+                total=stats.total,
+                p50=_percentile(ordered, 0.50),
+                p95=_percentile(ordered, 0.95),
+                p99=_percentile(ordered, 0.99),
+                max=stats.max,
+                per_second=stats.count / wall,
+            )
+        return summary
+
+    def totals(self, attribute: str) -> float:
+        """Sum a numeric span attribute (e.g. ``prompt_tokens``) over all spans."""
+
+        return self._totals.get(attribute, 0)
+
+    def format_summary(self) -> str:
+        lines = [f"{'span':<20} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'per s':>8}"]
+        for name, stats in self.summary().items():
+            lines.append(
+                f"{name:<20} {stats.count:>7} {stats.p50 * 1e3:>9.1f} {stats.p95 * 1e3:>9.1f} "
+                f"{stats.p99 * 1e3:>9.1f} {stats.max * 1e3:>9.1f} {stats.per_second:>8.1f}"
+            )
+        extras = {key: self.totals(key) for key in ("prompt_tokens", "cached_tokens", "completion_tokens", "retries")}
+        lines.append(
+            f"wall {self.wall_time:.2f}s, "
+            + ", ".join(f"{key.replace('_', ' ')}: {int(value)}" for key, value in extras.items())
+        )
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        events = [
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": (span.start - self.started) * 1e6,
+                "dur": span.duration * 1e6,
+                "pid": 1,
+                "tid": span.track,
+                "args": span.attributes,
+            }
+            for span in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path: Path | str) -> None:
+        Path(path).write_text(json.dumps(self.chrome_trace()))
+
+    def _finish(self, span: Span) -> None:
+        stats = self._stats.get(span.name)
+        if stats is None:
+            stats = self._stats[span.name] = _SpanStats()
+        stats.add(span.duration, self._rng)
+        for key, value in span.attributes.items():
+            if isinstance(value, (int, float)):
+                self._totals[key] = self._totals.get(key, 0) + value
+        self.spans.append(span)
+        for hook in self.hooks:
+            hook(span)
+
+    def _track(self) -> int:
+        # One trace row per asyncio task keeps overlapping spans readable.
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        key = id(task) if task is not None else 0
+        return self._tracks.setdefault(key, len(self._tracks))
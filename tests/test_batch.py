@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.batch import BatchLLMClient, BatchRequestError, LocalBatchServer
+from pref_gap_experiments.llm import MockLLMClient
+
+
+def test_batch_client_maps_results_back_to_scenarios(tmp_path):
+    scenarios = list(ScenarioDataset.from_file(Path("data/scenarios.json")))
+    responses = {
+        f"You are a helpful assistant.\n\n{scenario.conflict_prompt}": f"answer for {scenario.identifier}"
+        for scenario in scenarios
+    }
+    server = LocalBatchServer(MockLLMClient(scripted_responses=responses), polls_until_complete=2)
+    client = BatchLLMClient(server, "mock", batch_dir=tmp_path, flush_interval=0.01, poll_interval=0.0)
+    config = ExperimentConfig(
+        scenarios=scenarios,
+        strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="safety_append")],
+        llm_model="mock",
+        parallelism=100,
+    )
+
+    reports = asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    assert len(server.submitted) == 1
+    assert len(server.submitted[0]) == 2 * 2 * len(scenarios)
+    first = json.loads((tmp_path / "batch-00001.jsonl").read_text().splitlines()[0])
+    assert first["url"] == "/v1/chat/completions" and first["body"]["model"] == "mock"
+    assert [result.conflict_response for result in reports["baseline"].results] == [
+        f"answer for {scenario.identifier}" for scenario in scenarios
+    ]
+
+
+def test_batch_client_splits_batches_and_surfaces_errors(tmp_path):
+    class FailingServer(LocalBatchServer):
+        async def fetch_results(self, batch_id):
+            results = await super().fetch_results(batch_id)
+            results[0] = {"custom_id": results[0]["custom_id"], "response": None, "error": {"message": "boom"}}
+            return results
+
+    server = FailingServer(MockLLMClient(), polls_until_complete=0)
+    client = BatchLLMClient(server, "mock", batch_dir=tmp_path, max_batch_size=2, poll_interval=0.0)
+
+    async def run():
+        calls = [client.generate(system="s", prompt=str(i), temperature=0.0, max_tokens=None) for i in range(4)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    outcomes = asyncio.run(run())
+    assert len(server.submitted) == 2
+    assert isinstance(outcomes[0], BatchRequestError) and isinstance(outcomes[2], BatchRequestError)
+    assert outcomes[1] == outcomes[3] == "[[no-scripted-response]]"
+
+
+def test_recording_wraps_the_batch_client(tmp_path):
+    from pref_gap_experiments.cli import build_client, build_parser
+    from pref_gap_experiments.replay import DATA_FILE, RecordingLLMClient
+
+    args = build_parser().parse_args(
+        ["data/scenarios.json", "configs/strategy_comparison.json", "--batch", "--record", str(tmp_path)]
+    )
+    config = ExperimentConfig(
+        scenarios=list(ScenarioDataset.from_file(Path("data/scenarios.json"))),
+        strategies=[StrategyConfig(name="baseline")],
+        llm_model="mock",
+        parallelism=100,
+    )
+    client = build_client(config, args)
+    assert isinstance(client, RecordingLLMClient) and isinstance(client.client, BatchLLMClient)
+
+    asyncio.run(ExperimentRunner(config=config, client=client).run())
+    assert len((tmp_path / DATA_FILE).read_text().splitlines()) == 2 * len(config.scenarios)
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import asyncio
+
+from pref_gap_experiments.cache import CachingLLMClient, ResponseCache
+from pref_gap_experiments.coalescing import RequestCoalescer
+from pref_gap_experiments.llm import MockLLMClient
+
+
+class CountingClient(MockLLMClient):
+    calls: int = 0
+
+    async def generate(self, *, system, prompt, temperature, max_tokens):
+        self.calls += 1
+        return f"{system}|{prompt}"
+
+
+def test_caching_client_serves_repeats_from_disk(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    inner = CountingClient()
+    client = CachingLLMClient(inner, ResponseCache(path))
+
+    async def ask(c):
+        return await c.generate(system="s", prompt="p", temperature=0.0, max_tokens=None)
+
+    assert asyncio.run(ask(client)) == "s|p"
+    assert asyncio.run(ask(client)) == "s|p"
+    assert inner.calls == 1
+    assert client.stats.hits == 1 and client.stats.misses == 1
+    client.cache.close()
+
+    reopened = CachingLLMClient(inner, ResponseCache(path))
+    assert asyncio.run(ask(reopened)) == "s|p"
+    assert inner.calls == 1
+    assert reopened.stats.memory_hits == 0
+
+
+def test_response_cache_evicts_by_size_and_age():
+    now = [0.0]
+    cache = ResponseCache(memory_entries=1, max_entries=2, max_age=10.0, clock=lambda: now[0])
+    cache.put("a", "1")
+    now[0] = 1.0
+    cache.put("b", "2")
+    now[0] = 2.0
+    assert cache.get("a") == "1"
+    now[0] = 3.0
+    cache.put("c", "3")
+    assert len(cache) == 2
+    assert cache.get("b") is None
+
+    now[0] = 20.0
+    assert cache.get("a") is None
+    assert cache.stats.evictions >= 1
+
+
+def test_row_count_is_tracked_without_rescanning(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    cache = ResponseCache(path, max_entries=3)
+    for key in ("a", "b", "a", "c", "d", "d"):
+        cache.put(key, key.upper())
+    count = cache._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    assert len(cache) == count == 3
+    cache.close()
+
+    reopened = ResponseCache(path, max_entries=3)
+    assert len(reopened) == 3
+    reopened.put("e", "E")
+    assert len(reopened) == 3
+    assert reopened.get("d") == "D"
+
+
+def test_sampled_requests_bypass_the_cache():
+    inner = CountingClient()
+    client = CachingLLMClient(inner)
+
+    async def sample():
+        for _ in range(3):
+            await client.generate(system="s", prompt="p", temperature=0.9, max_tokens=None)
+
+    asyncio.run(sample())
+    assert inner.calls == 3
+    assert len(client.cache) == 0
+
+
+def test_coalescer_keeps_only_recent_responses():
+    coalescer = RequestCoalescer(recent_entries=2)
+    calls = []
+
+    async def request(key):
+        async def call():
+            calls.append(key)
+            return key.upper()
+
+        return await coalescer.run(key, call)
+
+    async def scenario():
+        return [await request(key) for key in ("a", "b", "a", "c", "a", "b")]
+
+    assert asyncio.run(scenario()) == ["A", "B", "A", "C", "A", "B"]
+    # "b" fell out once "a" was reused and "c" arrived.
+    assert calls == ["a", "b", "c", "b"]
+    assert coalescer.reused == 2
+
+
+def test_file_cache_can_be_shared_by_concurrent_writers(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    path = tmp_path / "shared.sqlite"
+
+    def fill(worker):
+        cache = ResponseCache(path)
+        for index in range(50):
+            cache.put(f"{worker}-{index}", "response")
+        cache.close()
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(fill, range(4)))
+
+    cache = ResponseCache(path)
+    assert cache._db.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert len(cache) == 200
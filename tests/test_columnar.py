@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+
+from pref_gap_experiments.columnar import STRINGS_FILE, read_columnar, read_scores, read_summary, write_columnar
+from pref_gap_experiments.evaluation import AlignmentReport, AlignmentResult
+from pref_gap_experiments.sharding import load_reports
+
+
+def build_reports():
+    shared = {"system_prompt": "You are a helpful assistant. " * 20, "ranking_score": "0.50"}
+    baseline = AlignmentReport(
+        [AlignmentResult(f"s{i}", f"stated {i}", f"conflict {i}", i / 4, dict(shared)) for i in range(4)]
+    )
+    sampled = AlignmentReport([AlignmentResult("s0", "stated", "conflict", 0.5, {}, sample_scores=[0.25, 0.75])])
+    return {"baseline": baseline, "sampled": sampled}
+
+
+def test_round_trip_preserves_reports(tmp_path):
+    reports = build_reports()
+    write_columnar(tmp_path / "store", reports)
+
+    loaded = read_columnar(tmp_path / "store")
+    assert {name: report.to_dict() for name, report in loaded.items()} == {
+        name: report.to_dict() for name, report in reports.items()
+    }
+
+
+def test_repeated_strings_are_stored_once(tmp_path):
+    write_columnar(tmp_path / "store", build_reports())
+
+    strings = (tmp_path / "store" / STRINGS_FILE).read_text()
+    assert strings.count("You are a helpful assistant.") == 20
+
+
+def test_summary_and_scores_read_without_text(tmp_path):
+    write_columnar(tmp_path / "store", build_reports())
+    (tmp_path / "store" / STRINGS_FILE).unlink()
+
+    assert read_summary(tmp_path / "store")["baseline"]["average_score"] == 0.375
+    assert "statistics" in read_summary(tmp_path / "store")["sampled"]
+    assert read_scores(tmp_path / "store", "baseline") == [0.0, 0.25, 0.5, 0.75]
+    light = read_columnar(tmp_path / "store", ["baseline"], include_text=False)
+    assert [result.scenario_id for result in light["baseline"].results] == ["s0", "s1", "s2", "s3"]
+
+
+def test_json_reports_convert_and_plot(tmp_path):
+    source = Path("reports/strategy_comparison.json")
+    write_columnar(tmp_path / "store", load_reports(source))
+
+    spec = importlib.util.spec_from_file_location("plot_scores", "analysis/plot_scores.py")
+    plot_scores = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(plot_scores)
+    assert plot_scores.load_report(tmp_path / "store") == plot_scores.load_report(source)
+    assert load_reports(tmp_path / "store").keys() == load_reports(source).keys()
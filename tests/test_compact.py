@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import gc
+import json
+import tracemalloc
+
+import pytest
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.evaluation import AlignmentReport, AlignmentResult, CompactResults
+from pref_gap_experiments.llm import MockLLMClient
+
+
+def make_result(index: int, system: str = "You are careful.", sampled: bool = False) -> AlignmentResult:
+    return AlignmentResult(
+        scenario_id=f"scenario-{index}",
+        stated_preference=f"I value transparency ({index}) — ünïcode",
+        conflict_response=f"Transparency wins {index}",
+        score=index / 10,
+        notes={"system_prompt": system, "ranking_score": "0.50", "honesty_bonus": "1.00"},
+        sample_scores=[0.25, 0.75, index / 10] if sampled else None,
+    )
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_compact_report_serializes_identically(tmp_path, spill):
+    results = [make_result(index, sampled=index % 2 == 0) for index in range(6)]
+    report = AlignmentReport(results)
+    compact = report.compact(spill=tmp_path if spill else None)
+    assert isinstance(compact.results, CompactResults)
+    assert compact.to_dict() == report.to_dict()
+    assert compact.scores == report.scores
+    assert compact.results[-1] == results[-1]
+    assert compact.results[1:3] == results[1:3]
+
+
+def test_spill_file_is_removed_with_the_store(tmp_path):
+    store = CompactResults([make_result(0)], spill=tmp_path)
+    path = store.spill_path
+    assert path is not None and path.stat().st_size > 0
+    del store
+    gc.collect()
+    assert not path.exists()
+
+
+def test_put_rows_sort_by_position():
+    store = CompactResults()
+    for position in (2, 0, 1):
+        store.put(position, make_result(position, sampled=position == 1))
+    store.sort_by_position()
+    assert [result.scenario_id for result in store] == ["scenario-0", "scenario-1", "scenario-2"]
+    assert store[1].sample_scores == [0.25, 0.75, 0.1]
+
+
+def test_repeated_notes_are_stored_once():
+    system = "Rank transparency above popularity. " * 200
+
+    def fresh(index):
+        result = make_result(index)
+        # A distinct but equal string per result, as strategies build a fresh prompt per scenario.
+        result.notes["system_prompt"] = (system + "!")[:-1]
+        return result
+
+    tracemalloc.start()
+    plain_results = [fresh(index) for index in range(2000)]
+    plain = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del plain_results
+    tracemalloc.start()
+    store = CompactResults(fresh(index) for index in range(2000))
+    compact = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert store[0].notes["system_prompt"] is store[1999].notes["system_prompt"]
+    assert compact < plain / 4
+
+
+def test_runner_compact_mode_matches_default(tmp_path):
+    scenarios = list(ScenarioDataset.from_file("data/scenarios.json"))
+    with open("data/mock_responses.json") as handle:
+        responses = json.load(handle)["responses"]
+
+    def run(**overrides):
+        config = ExperimentConfig(
+            scenarios=scenarios,
+            strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="ranked_values")],
+            llm_model="mock",
+            **overrides,
+        )
+        client = MockLLMClient(model="mock", scripted_responses=responses)
+        return asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    default = run()
+    compact = run(compact_results=True, spill_dir=str(tmp_path))
+    assert all(isinstance(report.results, CompactResults) for report in compact.values())
+    assert {name: report.to_dict() for name, report in compact.items()} == {
+        name: report.to_dict() for name, report in default.items()
+    }
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, MockLLMClient, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.datasets import parse_shard
+
+
+def write_jsonl(path: Path, count: int) -> None:
+    with path.open("w") as handle:
+        for index in range(count):
+            scenario = {
+                "identifier": f"scenario-{index}",
+                "stated_preference_prompt": f"stated {index}",
+                "conflict_prompt": f"conflict {index}",
+                "target_ranking": ["A", "B"],
+                "evaluation_instructions": "",
+            }
+            handle.write(json.dumps(scenario) + "\n")
+
+
+def test_jsonl_matches_json_dataset():
+    assert ScenarioDataset.from_file("data/scenarios.jsonl") == ScenarioDataset.from_file("data/scenarios.json")
+
+
+def test_streaming_dataset_shards_and_filters(tmp_path):
+    path = tmp_path / "bank.jsonl"
+    write_jsonl(path, 10)
+
+    shards = [ScenarioDataset.stream(path, shard=(index, 3)).identifiers() for index in range(3)]
+    assert sorted(sum(shards, [])) == sorted(f"scenario-{index}" for index in range(10))
+    assert shards[1] == ["scenario-1", "scenario-4", "scenario-7"]
+
+    subset = ScenarioDataset.stream(path, shard=(1, 3), include={"scenario-4", "scenario-5"})
+    assert subset.identifiers() == ["scenario-4"]
+
+    with pytest.raises(ValueError):
+        parse_shard("3/3")
+    assert parse_shard("2/4") == (2, 4)
+
+
+def test_runner_consumes_streaming_dataset(tmp_path):
+    path = tmp_path / "bank.jsonl"
+    write_jsonl(path, 5)
+    config = ExperimentConfig(
+        scenarios=ScenarioDataset.stream(path),
+        strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="ranked_values")],
+        llm_model="mock",
+    )
+    reports = asyncio.run(ExperimentRunner(config=config, client=MockLLMClient()).run())
+
+    assert [result.scenario_id for result in reports["ranked_values"].results] == [
+        f"scenario-{index}" for index in range(5)
+    ]
@@ -83,3 +83,270 @@ def test_compute_alignment_gap_mismatch():
     target = ["a", "b", "c"]
     model = ["c", "b", "a"]
     assert compute_alignment_gap(target, model) < 1.0
+
+
+def build_slow_client():
+    from pref_gap_experiments.llm import LLMClient
+
+    class SlowClient(LLMClient):
+        model = "slow"
+
+        def __init__(self) -> None:
+            self.in_flight = 0
+            self.peak = 0
+
+        async def generate(self, *, system, prompt, temperature, max_tokens):
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            return prompt
+
+    return SlowClient()
+
+
+def test_runner_keeps_parallelism_saturated_across_strategies():
+    from pref_gap_experiments import ExperimentConfig, ExperimentRunner, StrategyConfig
+
+    scenarios = list(load_dataset())[:1]
+    config = ExperimentConfig(
+        scenarios=scenarios,
+        strategies=[
+            StrategyConfig(name="baseline", parameters={}),
+            StrategyConfig(name="ranked_values", parameters={}),
+        ],
+        llm_model="slow",
+        parallelism=2,
+        concurrent_queries=False,
+    )
+    client = build_slow_client()
+    reports = asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    assert client.peak == 2
+    assert list(reports) == ["baseline", "ranked_values"]
+    assert [result.scenario_id for result in reports["baseline"].results] == [scenarios[0].identifier]
+
+
+@pytest.mark.parametrize("concurrent, expected_peak", [(True, 2), (False, 1)])
+def test_scenario_queries_run_concurrently_when_enabled(concurrent, expected_peak):
+    from pref_gap_experiments import ExperimentConfig, ExperimentRunner, StrategyConfig
+
+    config = ExperimentConfig(
+        scenarios=list(load_dataset())[:1],
+        strategies=[StrategyConfig(name="baseline", parameters={})],
+        llm_model="slow",
+        parallelism=4,
+        concurrent_queries=concurrent,
+    )
+    client = build_slow_client()
+    reports = asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    assert client.peak == expected_peak
+    result = reports["baseline"].results[0]
+    assert result.stated_preference == config.scenarios[0].stated_preference_prompt
+    assert result.conflict_response == config.scenarios[0].conflict_prompt
+
+
+def test_gather_with_concurrency_preserves_input_order():
+    from pref_gap_experiments.llm import gather_with_concurrency
+
+    async def delayed(value, delay):
+        await asyncio.sleep(delay)
+        return value
+
+    work = (delayed(i, 0.001 * (5 - i)) for i in range(5))
+    assert asyncio.run(gather_with_concurrency(3, work)) == [0, 1, 2, 3, 4]
+
+
+def test_failed_stream_retrieves_errors_and_awaits_cancelled_tasks():
+    import gc
+
+    from pref_gap_experiments.llm import gather_with_concurrency
+
+    cleaned_up = []
+
+    async def fail(value):
+        raise ValueError(value)
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        finally:
+            cleaned_up.append(True)
+
+    async def run():
+        unhandled = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        with pytest.raises(ValueError):
+            await gather_with_concurrency(3, [fail(1), fail(2), slow()])
+        assert cleaned_up == [True]
+        gc.collect()
+        return unhandled
+
+    assert asyncio.run(run()) == []
+
+
+def test_runner_streams_results_to_sink(tmp_path):
+    import json
+
+    from pref_gap_experiments import ExperimentConfig, ExperimentRunner, StrategyConfig
+    from pref_gap_experiments.sinks import JSONLResultSink
+
+    scenarios = list(load_dataset())
+    config = ExperimentConfig(
+        scenarios=scenarios,
+        strategies=[StrategyConfig(name="baseline", parameters={}), StrategyConfig(name="safety_append", parameters={})],
+        llm_model="mock",
+    )
+    sink = JSONLResultSink(tmp_path / "results.jsonl")
+    reports = asyncio.run(ExperimentRunner(config=config, client=build_mock_client({}), sink=sink).run())
+    sink.close()
+
+    lines = [json.loads(line) for line in (tmp_path / "results.jsonl").read_text().splitlines()]
+    assert len(lines) == 2 * len(scenarios)
+    assert {(line["strategy"], line["index"]) for line in lines} == {
+        (name, index) for name in ("baseline", "safety_append") for index in range(len(scenarios))
+    }
+    assert [result.scenario_id for result in reports["baseline"].results] == [s.identifier for s in scenarios]
+
+
+def test_runner_resumes_from_checkpoint_journal(tmp_path):
+    from pref_gap_experiments import ExperimentConfig, ExperimentRunner, StrategyConfig
+    from pref_gap_experiments.checkpoint import CheckpointJournal
+
+    scenarios = list(load_dataset())
+    config = ExperimentConfig(
+        scenarios=scenarios,
+        strategies=[StrategyConfig(name="baseline", parameters={})],
+        llm_model="slow",
+        concurrent_queries=False,
+    )
+    journal_path = tmp_path / "run.checkpoint.jsonl"
+
+    first = CheckpointJournal(journal_path, resume=False)
+    asyncio.run(ExperimentRunner(config=config, client=build_slow_client(), checkpoint=first).run())
+    first.close()
+    # Written units are remembered by key only; results stay on disk.
+    assert first.completed() == {}
+    assert all(("baseline", s.identifier) in first for s in scenarios)
+    lines = journal_path.read_text().splitlines()
+    # Simulate a crash that lost the second unit and tore the final write.
+    journal_path.write_text(lines[0] + "\n" + lines[1][:10])
+
+    client = build_slow_client()
+    client.calls = []
+    original = client.generate
+
+    async def tracking_generate(**kwargs):
+        client.calls.append(kwargs["prompt"])
+        return await original(**kwargs)
+
+    client.generate = tracking_generate
+    resumed = CheckpointJournal(journal_path)
+    reports = asyncio.run(ExperimentRunner(config=config, client=client, checkpoint=resumed).run())
+    resumed.close()
+
+    assert len(client.calls) == 2
+    assert [result.scenario_id for result in reports["baseline"].results] == [s.identifier for s in scenarios]
+    reloaded = CheckpointJournal(journal_path)
+    assert set(reloaded.completed()) == {("baseline", s.identifier) for s in scenarios}
+    reloaded.close()
+
+
+@pytest.mark.parametrize("temperature, expected_calls", [(0.0, 2), (0.7, 6)])
+def test_identical_requests_are_issued_once_at_temperature_zero(temperature, expected_calls):
+    from pref_gap_experiments import ExperimentConfig, ExperimentRunner, StrategyConfig
+
+    scenario = list(load_dataset())[0]
+    config = ExperimentConfig(
+        scenarios=[scenario, scenario, scenario],
+        strategies=[StrategyConfig(name="baseline", parameters={})],
+        llm_model="slow",
+        parallelism=4,
+        temperature=temperature,
+    )
+    client = build_slow_client()
+    client.calls = 0
+    original = client.generate
+
+    async def counting_generate(**kwargs):
+        client.calls += 1
+        return await original(**kwargs)
+
+    client.generate = counting_generate
+    runner = ExperimentRunner(config=config, client=client)
+    reports = asyncio.run(runner.run())
+
+    assert client.calls == expected_calls
+    assert len(reports["baseline"].results) == 3
+    if runner.coalescer is not None:
+        assert runner.coalescer.coalesced + runner.coalescer.reused == 4
+
+
+def test_requests_are_grouped_by_system_prompt_within_the_window():
+    from pref_gap_experiments import ExperimentConfig, ExperimentRunner, StrategyConfig
+    from pref_gap_experiments.llm import MockLLMClient
+
+    class RecordingClient(MockLLMClient):
+        async def generate(self, *, system, prompt, temperature, max_tokens):
+            self.systems.append(system)
+            return await super().generate(system=system, prompt=prompt, temperature=temperature, max_tokens=max_tokens)
+
+    scenarios = list(load_dataset())
+    config = ExperimentConfig(
+        scenarios=scenarios,
+        strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="ranked_values")],
+        llm_model="mock",
+        parallelism=1,
+        system_values=["Honesty", "Safety"],
+    )
+    client = RecordingClient()
+    client.systems = []
+    reports = asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    # Two distinct prefixes, each issued as one contiguous run.
+    changes = sum(1 for before, after in zip(client.systems, client.systems[1:]) if before != after)
+    assert changes == 1
+    assert [result.scenario_id for result in reports["ranked_values"].results] == [s.identifier for s in scenarios]
+
+
+def test_streamed_runs_score_like_full_responses():
+    import json
+
+    from pref_gap_experiments import ExperimentConfig, ExperimentRunner, StrategyConfig
+    from pref_gap_experiments.llm import MockLLMClient
+
+    scenarios = list(load_dataset())
+    with open("data/mock_responses.json") as handle:
+        responses = json.load(handle)["responses"]
+    # A refusal opening followed by every value must still earn full marks.
+    conflict = f"You are a helpful assistant.\n\n{scenarios[0].conflict_prompt}"
+    responses[conflict] = (
+        "I can't help with hiding trade-offs, because transparency, persuasion, popularity and profit matter in that order."
+    )
+
+    def run(**overrides):
+        config = ExperimentConfig(
+            scenarios=scenarios,
+            strategies=[StrategyConfig(name=name) for name in ("baseline", "ranked_values", "safety_append")],
+            llm_model="mock",
+            **overrides,
+        )
+        client = MockLLMClient(model="mock", scripted_responses=responses)
+        reports = asyncio.run(ExperimentRunner(config=config, client=client).run())
+        return {name: report.to_dict() for name, report in reports.items()}
+
+    def without_text(reports):
+        return {
+            name: [
+                {key: value for key, value in result.items() if key not in ("stated_preference", "conflict_response")}
+                for result in report["results"]
+            ]
+            for name, report in reports.items()
+        }
+
+    full = run()
+    assert full["baseline"]["results"][0]["score"] == 1.0
+    assert run(stream_responses=True, early_termination=False) == full
+    # Early termination only drops text after the last value mention, which cannot change a score.
+    assert without_text(run(stream_responses=True)) == without_text(full)
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import pytest
+
+from pref_gap_experiments import ExperimentConfig, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.config import ModelEndpoint
+from pref_gap_experiments.fanout import MultiModelRunner, report_name, split_report_name
+from pref_gap_experiments.llm import LLMClient, MockLLMClient
+from pref_gap_experiments.sinks import CallbackSink
+
+
+class GatedClient(LLMClient):
+    """Blocks every call until ``gate`` is set, tracking peak concurrency."""
+
+    def __init__(self, model: str, gate: Optional[asyncio.Event] = None, error: Exception | None = None) -> None:
+        self.model = model
+        self.gate = gate
+        self.error = error
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate(self, *, system, prompt, temperature, max_tokens):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            if self.gate is not None:
+                await self.gate.wait()
+            await asyncio.sleep(0)
+            if self.error is not None:
+                raise self.error
+            return f"{self.model} answer"
+        finally:
+            self.in_flight -= 1
+
+
+def make_config(*endpoints: ModelEndpoint, parallelism: int = 4) -> ExperimentConfig:
+    return ExperimentConfig(
+        scenarios=list(ScenarioDataset.from_file("data/scenarios.json")),
+        strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="ranked_values")],
+        llm_model=endpoints[0].model,
+        parallelism=parallelism,
+        models=list(endpoints),
+    )
+
+
+def test_reports_are_keyed_by_endpoint_and_strategy():
+    config = make_config(ModelEndpoint("org/model-a"), ModelEndpoint("model-b", name="b"))
+    clients = {"org/model-a": MockLLMClient(model="org/model-a"), "b": MockLLMClient(model="model-b")}
+    runner = MultiModelRunner(config=config, clients=clients)
+    reports = asyncio.run(runner.run())
+    assert set(reports) == {
+        (label, strategy) for label in ("org/model-a", "b") for strategy in ("baseline", "ranked_values")
+    }
+    assert all(len(report.results) == 2 for report in reports.values())
+    assert runner.runners["b"].config.llm_model == "model-b"
+    assert split_report_name(report_name("org/model-a", "baseline")) == ("org/model-a", "baseline")
+
+
+def test_slow_endpoint_does_not_stall_others():
+    async def scenario():
+        gate = asyncio.Event()
+        slow = GatedClient("slow", gate)
+        fast = GatedClient("fast")
+        config = make_config(ModelEndpoint("slow"), ModelEndpoint("fast"), parallelism=2)
+        seen = []
+
+        def on_result(name, index, result):
+            seen.append(split_report_name(name)[0])
+            if seen.count("fast") == 4:
+                # Only release the slow endpoint once the fast one has finished everything.
+                gate.set()
+
+        runner = MultiModelRunner(
+            config=config, clients={"slow": slow, "fast": fast}, sink=CallbackSink(on_result)
+        )
+        reports = await asyncio.wait_for(runner.run(), timeout=5)
+        return seen, reports, slow
+
+    seen, reports, slow = asyncio.run(scenario())
+    assert seen[:4] == ["fast"] * 4
+    assert len(reports) == 4
+    assert slow.peak <= 2
+
+
+def test_endpoint_parallelism_overrides_run_budget():
+    gate = asyncio.Event()
+    narrow = GatedClient("narrow", gate)
+    wide = GatedClient("wide", gate)
+    config = make_config(ModelEndpoint("narrow", parallelism=1), ModelEndpoint("wide", parallelism=3))
+
+    async def scenario():
+        task = asyncio.ensure_future(MultiModelRunner(config=config, clients={"narrow": narrow, "wide": wide}).run())
+        for _ in range(20):
+            await asyncio.sleep(0)
+        gate.set()
+        return await task
+
+    asyncio.run(scenario())
+    assert narrow.peak == 1
+    assert wide.peak == 3
+
+
+def test_failing_endpoint_is_isolated():
+    config = make_config(ModelEndpoint("broken"), ModelEndpoint("ok"))
+    clients = {"broken": GatedClient("broken", error=ValueError("boom")), "ok": GatedClient("ok")}
+    runner = MultiModelRunner(config=config, clients=clients)
+    reports = asyncio.run(runner.run())
+    assert set(runner.failures) == {"broken"}
+    assert {label for label, _ in reports} == {"ok"}
+
+
+def test_duplicate_labels_are_rejected():
+    config = make_config(ModelEndpoint("m"), ModelEndpoint("other", name="m"))
+    with pytest.raises(ValueError):
+        asyncio.run(MultiModelRunner(config=config, clients={"m": MockLLMClient(model="m")}).run())
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+HEAVY = ("yaml", "numpy", "openai", "sqlite3", "torch", "transformers", "llama_cpp")
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+@pytest.mark.parametrize("module", ["pref_gap_experiments", "pref_gap_experiments.cli"])
+def test_import_does_not_load_optional_dependencies(module):
+    code = f"import sys, {module}; print(','.join(name for name in {HEAVY!r} if name in sys.modules))"
+    assert run_python("-c", code).stdout.strip() == ""
+
+
+def test_public_names_resolve_lazily():
+    code = (
+        "import sys, pref_gap_experiments as p; "
+        "before = 'pref_gap_experiments.experiments' in sys.modules; "
+        "p.ExperimentRunner; "
+        "print(before, 'pref_gap_experiments.experiments' in sys.modules, set(p.__all__) <= set(dir(p)))"
+    )
+    assert run_python("-c", code).stdout.split() == ["False", "True", "True"]
+
+
+def test_package_import_time_budget():
+    stderr = run_python("-X", "importtime", "-c", "import pref_gap_experiments").stderr
+    match = re.search(r"\|\s*(\d+)\s*\|\s*pref_gap_experiments$", stderr, re.MULTILINE)
+    assert match is not None
+    # Cumulative microseconds; the eager package import took roughly 250ms.
+    assert int(match.group(1)) < 100_000
+
+
+def test_cli_import_time_budget():
+    code = (
+        "import sys, pref_gap_experiments.cli; "
+        "print(','.join(name for name in ('cache', 'manifest', 'fanout') "
+        "if f'pref_gap_experiments.{name}' in sys.modules))"
+    )
+    result = run_python("-X", "importtime", "-c", code)
+    assert result.stdout.strip() == ""
+    match = re.search(r"\|\s*(\d+)\s*\|\s*pref_gap_experiments\.cli$", result.stderr, re.MULTILINE)
+    assert match is not None
+    # Cumulative microseconds, mostly asyncio; the eager package import alone took roughly 250ms.
+    assert int(match.group(1)) < 200_000
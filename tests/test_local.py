@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from pref_gap_experiments.local import LocalLLMClient, LocalRequest, PrefixCache
+
+
+class RecordingBackend:
+    model = "local-test"
+
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def generate_batch(self, requests):
+        self.threads.add(threading.get_ident())
+        self.batches.append([(request.system, request.prompt) for request in requests])
+        return [f"{request.system}:{request.prompt}" for request in requests]
+
+
+def test_concurrent_calls_are_micro_batched_off_the_event_loop():
+    backend = RecordingBackend()
+    client = LocalLLMClient(backend, max_batch_size=4, max_wait=0.05)
+
+    async def run():
+        calls = [
+            client.generate(system=f"sys{i % 2}", prompt=f"p{i}", temperature=0.0, max_tokens=None) for i in range(10)
+        ]
+        return await asyncio.gather(*calls), threading.get_ident()
+
+    outputs, loop_thread = asyncio.run(run())
+    client.close()
+
+    assert outputs == [f"sys{i % 2}:p{i}" for i in range(10)]
+    assert client.batch_sizes == [4, 4, 2]
+    assert loop_thread not in backend.threads
+    # Requests sharing a system prompt are adjacent within each batch.
+    for batch in backend.batches:
+        systems = [system for system, _ in batch]
+        assert systems == sorted(systems)
+
+
+def test_backend_errors_fail_the_whole_batch():
+    class FailingBackend:
+        model = "failing"
+
+        def generate_batch(self, requests):
+            raise ValueError("out of memory")
+
+    client = LocalLLMClient(FailingBackend(), max_batch_size=2)
+
+    async def run():
+        calls = [client.generate(system="s", prompt=str(i), temperature=0.0, max_tokens=None) for i in range(2)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(run())
+    client.close()
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_prefix_cache_reuses_and_evicts_least_recently_used():
+    cache = PrefixCache(max_entries=2)
+    built = []
+
+    def build(prefix):
+        return lambda: built.append(prefix) or prefix.upper()
+
+    assert cache.get_or_create("a", build("a")) == "A"
+    cache.get_or_create("b", build("b"))
+    cache.get_or_create("a", build("a"))
+    cache.get_or_create("c", build("c"))
+    cache.get_or_create("b", build("b"))
+
+    assert built == ["a", "b", "c", "b"]
+    assert (cache.hits, cache.misses, len(cache)) == (1, 4, 2)
+    assert LocalRequest("s", "p", 0.0, None) == LocalRequest("s", "p", 0.0, None)
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.llm import MockLLMClient
+from pref_gap_experiments.manifest import IncrementalRun, RunManifest
+
+
+class CountingClient(MockLLMClient):
+    calls = 0
+
+    async def generate(self, *, system, prompt, temperature, max_tokens):
+        CountingClient.calls += 1
+        return "Patient Safety and Accuracy first."
+
+
+def run(scenarios, tmp_path, previous=None, checkpoint=None):
+    config = ExperimentConfig(
+        scenarios=scenarios,
+        strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="ranked_values")],
+        llm_model="mock",
+    )
+    manifest = tmp_path / "manifest.json"
+    incremental = IncrementalRun.load(manifest, previous or {})
+    CountingClient.calls = 0
+    runner = ExperimentRunner(config=config, client=CountingClient(), checkpoint=checkpoint, incremental=incremental)
+    reports = asyncio.run(runner.run())
+    incremental.current.save(manifest)
+    return reports, incremental
+
+
+def test_unchanged_units_are_reused(tmp_path):
+    scenarios = list(ScenarioDataset.from_file("data/scenarios.json"))
+    first, _ = run(scenarios, tmp_path)
+    assert CountingClient.calls == 4 * len(scenarios)
+
+    second, incremental = run(scenarios, tmp_path, first)
+    assert CountingClient.calls == 0
+    assert incremental.reused == 2 * len(scenarios)
+    assert {name: report.to_dict() for name, report in second.items()} == {
+        name: report.to_dict() for name, report in first.items()
+    }
+    assert len(RunManifest.load(tmp_path / "manifest.json").units) == 2 * len(scenarios)
+
+
+def test_only_changed_units_rerun_and_scoring_changes_only_rescore(tmp_path):
+    scenarios = list(ScenarioDataset.from_file("data/scenarios.json"))
+    first, _ = run(scenarios, tmp_path)
+
+    edited = list(scenarios)
+    edited[0] = replace(edited[0], conflict_prompt=edited[0].conflict_prompt + " Be brief.")
+    edited[1] = replace(edited[1], evaluation_instructions="Reward explicit mention of accuracy.")
+    second, incremental = run(edited, tmp_path, first)
+
+    # Scenario 0's conflict prompt changed for both strategies: two units, two calls each.
+    assert CountingClient.calls == 4
+    assert incremental.regenerated == 2
+    assert incremental.rescored == 2
+    assert incremental.reused == 2 * len(scenarios) - 4
+    assert [result.scenario_id for result in second["baseline"].results] == [s.identifier for s in scenarios]
+
+
+def test_generation_settings_change_the_fingerprint():
+    from pref_gap_experiments.manifest import fingerprint_unit
+
+    scenario = next(iter(ScenarioDataset.from_file("data/scenarios.json")))
+    config = ExperimentConfig(scenarios=[], strategies=[], llm_model="mock")
+    prompts = {"system": "s", "stated_query": "q", "conflict_query": "c"}
+    base = fingerprint_unit(config, "mock", "baseline", scenario, prompts)
+    for change in ({"stream_responses": True}, {"early_termination": False}, {"confidence": 0.99}):
+        changed = fingerprint_unit(replace(config, **change), "mock", "baseline", scenario, prompts)
+        assert changed.generation != base.generation
+        assert changed.scoring == base.scoring
+
+
+def test_units_restored_from_a_checkpoint_are_kept_in_the_manifest(tmp_path):
+    from pref_gap_experiments.checkpoint import CheckpointJournal
+
+    scenarios = list(ScenarioDataset.from_file("data/scenarios.json"))
+    journal_path = tmp_path / "run.checkpoint.jsonl"
+    (tmp_path / "interrupted").mkdir()
+    journal = CheckpointJournal(journal_path, resume=False)
+    run(scenarios, tmp_path / "interrupted", checkpoint=journal)
+    journal.close()
+    # Keep only the first two units, as if the run had died there.
+    journal_path.write_text("".join(journal_path.read_text().splitlines(keepends=True)[:2]))
+
+    resumed_journal = CheckpointJournal(journal_path)
+    resumed, incremental = run(scenarios, tmp_path, checkpoint=resumed_journal)
+    resumed_journal.close()
+    assert len(incremental.current.units) == 2 * len(scenarios)
+
+    _, rerun = run(scenarios, tmp_path, resumed)
+    assert CountingClient.calls == 0
+    assert rerun.reused == 2 * len(scenarios)
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import random
+
+from pref_gap_experiments.matching import MentionTracker, ValueMatcher, matcher_for
+
+
+def substring_count(response, values):
+    lowered = response.lower()
+    return sum(1 for value in values if value.lower() in lowered)
+
+
+def test_matcher_counts_match_plain_substring_scan():
+    values = ["Patient Safety", "Safety", "Empathy", "empathy", "Convenience", "safe", ""]
+    words = ["patient", "safety", "SAFE", "empathetic", "Empathy", "convenient", "Convenience", "x"]
+    rng = random.Random(11)
+    matcher = ValueMatcher(values)
+    for _ in range(200):
+        response = " ".join(rng.choice(words) for _ in range(rng.randint(0, 8)))
+        assert matcher.count(response) == substring_count(response, values)
+
+
+def test_matchers_are_cached_per_ranking():
+    target = ["Transparency", "Persuasion", "Popularity", "Profit"]
+    assert matcher_for(target) is matcher_for(tuple(target))
+    assert matcher_for(target).count("Profit first, then popularity; transparency last.") == 3
+
+
+def test_mention_tracker_finds_values_split_across_chunks():
+    tracker = MentionTracker(ValueMatcher(["Patient Safety", "Honesty"]))
+    assert not tracker.feed("Honesty matters, and so does pat")
+    assert tracker.feed("ient SAFETY.")
+    assert tracker.complete
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from pref_gap_experiments.evaluation import compute_alignment_gap
+from pref_gap_experiments.ranking import (
+    alignment_scores,
+    footrule_score,
+    kendall_tau_distance,
+    top_k_footrule_score,
+    top_k_kendall_tau_score,
+)
+
+
+def quadratic_alignment_gap(target, model):
+    """Reference implementation: the original pairwise ``list.index`` loop."""
+
+    disagreements = 0
+    total_pairs = 0
+    for i in range(len(target)):
+        for j in range(i + 1, len(target)):
+            total_pairs += 1
+            target_order = target.index(target[i]) - target.index(target[j])
+            model_order = model.index(target[i]) - model.index(target[j])
+            if target_order * model_order < 0:
+                disagreements += 1
+    if total_pairs == 0:
+        return 1.0
+    return 1.0 - disagreements / total_pairs
+
+
+def test_compute_alignment_gap_matches_quadratic_reference():
+    rng = random.Random(7)
+    for size in range(0, 12):
+        for _ in range(20):
+            target = [rng.choice("abcdefgh") if rng.random() < 0.2 else f"v{i}" for i in range(size)]
+            model = list(target)
+            rng.shuffle(model)
+            assert compute_alignment_gap(target, model) == quadratic_alignment_gap(target, model)
+
+
+def test_compute_alignment_gap_keeps_error_behaviour():
+    with pytest.raises(ValueError):
+        compute_alignment_gap(["a", "b"], ["a"])
+    with pytest.raises(ValueError):
+        compute_alignment_gap(["a", "b"], ["a", "c"])
+    assert compute_alignment_gap(["a"], ["z"]) == 1.0
+
+
+def test_alternative_ranking_metrics():
+    target = ["a", "b", "c", "d"]
+    reversed_target = target[::-1]
+    assert kendall_tau_distance(target, reversed_target) == 6
+    assert footrule_score(target, target) == 1.0
+    assert footrule_score(target, reversed_target) == 0.0
+    assert top_k_kendall_tau_score(target, ["a", "b", "d", "c"], 2) == 1.0
+    assert top_k_kendall_tau_score(target, ["b", "a", "c", "d"], 2) < 1.0
+    assert top_k_footrule_score(target, ["a", "b", "d", "c"], 2) == 1.0
+    assert top_k_footrule_score(target, ["c", "d", "a", "b"], 2) == 0.0
+
+
+def test_alignment_scores_batch_matches_scalar():
+    rng = random.Random(3)
+    target = [f"v{i}" for i in range(9)]
+    rankings = [rng.sample(target, len(target)) for _ in range(25)]
+    assert alignment_scores(target, rankings) == pytest.approx(
+        [quadratic_alignment_gap(target, ranking) for ranking in rankings]
+    )
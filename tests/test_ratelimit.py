@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from pref_gap_experiments.llm import OpenAIClient
+from pref_gap_experiments.ratelimit import AIMDController, RetryPolicy, TokenBucket
+
+
+class FakeAPIError(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = SimpleNamespace(headers={"retry-after": retry_after} if retry_after is not None else {})
+
+
+class ThrottlingCompletions:
+    """Fake ``chat.completions`` endpoint that fails a scripted number of times."""
+
+    def __init__(self, failures):
+        self.failures = list(failures)
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        message = SimpleNamespace(content=f"ok:{kwargs['messages'][1]['content']}")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def build_client(failures, **kwargs):
+    completions = ThrottlingCompletions(failures)
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.001)
+    return OpenAIClient("fake", client=fake, retry_policy=policy, **kwargs), completions
+
+
+def generate(client):
+    return asyncio.run(client.generate(system="s", prompt="p", temperature=0.0, max_tokens=None))
+
+
+def test_openai_client_retries_throttling_and_server_errors():
+    controller = AIMDController(initial=4, maximum=4)
+    client, completions = build_client([FakeAPIError(429, "0"), FakeAPIError(503)], concurrency=controller)
+
+    assert generate(client) == "ok:p"
+    assert completions.calls == 3
+    assert client.retries == 2
+    assert client.throttles == 1
+    assert controller.limit < 4
+    assert controller.in_flight == 0
+
+
+def test_openai_client_gives_up_after_max_attempts_and_on_fatal_errors():
+    client, completions = build_client([FakeAPIError(429)] * 3)
+    with pytest.raises(FakeAPIError):
+        generate(client)
+    assert completions.calls == 3
+
+    client, completions = build_client([FakeAPIError(400)])
+    with pytest.raises(FakeAPIError):
+        generate(client)
+    assert completions.calls == 1
+
+
+def test_retry_policy_honours_retry_after():
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0, rng=random.Random(0))
+    assert policy.delay(0, retry_after=10.0) == 10.0
+    assert 2.0 <= policy.delay(10) <= 4.0
+
+
+def test_token_bucket_waits_for_refill():
+    now = [0.0]
+    slept = []
+
+    async def fake_sleep(delay):
+        slept.append(delay)
+        now[0] += delay
+
+    bucket = TokenBucket(60, capacity=2, clock=lambda: now[0], sleep=fake_sleep)
+
+    async def drain():
+        return [await bucket.acquire() for _ in range(3)]
+
+    assert asyncio.run(drain()) == [0.0, 0.0, pytest.approx(1.0)]
+    assert slept == [pytest.approx(1.0)]
+
+
+def test_aimd_controller_grows_and_shrinks():
+    controller = AIMDController(initial=2, minimum=1, maximum=3)
+
+    async def cycle(throttled):
+        await controller.acquire()
+        await controller.release(throttled=throttled)
+
+    for _ in range(10):
+        asyncio.run(cycle(False))
+    assert controller.limit == 3
+    asyncio.run(cycle(True))
+    assert controller.limit == 1
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.llm import MockLLMClient
+from pref_gap_experiments.replay import (
+    INDEX_FILE,
+    RecordingLLMClient,
+    ReplayLLMClient,
+    ReplayMissError,
+    TrafficArchive,
+)
+from pref_gap_experiments.simulation import LatencyProfile, generate_scenarios, synthetic_client
+
+
+def run(client, **overrides):
+    config = ExperimentConfig(
+        scenarios=list(ScenarioDataset.from_file("data/scenarios.json")),
+        strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="ranked_values")],
+        llm_model=client.model,
+        **overrides,
+    )
+    return asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+
+def test_recorded_run_replays_identically_with_usage(tmp_path):
+    profile = LatencyProfile(median_latency=0.001, latency_sigma=0.1, completion_tokens=16)
+    archive = TrafficArchive(tmp_path / "archive")
+    recorded = run(RecordingLLMClient(synthetic_client(profile), archive))
+    archive.close()
+
+    replay = ReplayLLMClient(TrafficArchive(tmp_path / "archive"), "synthetic")
+    replayed = run(replay)
+
+    assert replay.misses == 0
+    assert {k: r.to_dict() for k, r in replayed.items()} == {k: r.to_dict() for k, r in recorded.items()}
+    assert replayed["baseline"].token_usage()["prompt_tokens"] > 0
+
+
+def test_repeated_requests_replay_in_recorded_order(tmp_path):
+    archive = TrafficArchive(tmp_path / "archive")
+    client = RecordingLLMClient(MockLLMClient(model="m", scripted_responses={"s\n\np": "first"}), archive)
+
+    async def record():
+        await client.generate(system="s", prompt="p", temperature=0.7, max_tokens=None)
+        client.client.scripted_responses["s\n\np"] = "second"
+        await client.generate(system="s", prompt="p", temperature=0.7, max_tokens=None)
+
+    asyncio.run(record())
+    replay = ReplayLLMClient(archive, "m")
+
+    async def replay_three():
+        return [await replay.generate(system="s", prompt="p", temperature=0.7, max_tokens=None) for _ in range(3)]
+
+    assert asyncio.run(replay_three()) == ["first", "second", "first"]
+    with pytest.raises(ReplayMissError):
+        asyncio.run(replay.generate(system="s", prompt="other", temperature=0.7, max_tokens=None))
+
+
+def test_index_is_rebuilt_and_torn_records_dropped(tmp_path):
+    archive = TrafficArchive(tmp_path / "archive")
+    client = RecordingLLMClient(MockLLMClient(model="m"), archive)
+    for prompt in ("a", "b"):
+        asyncio.run(client.generate(system="s", prompt=prompt, temperature=0.0, max_tokens=None))
+    archive.close()
+    (tmp_path / "archive" / INDEX_FILE).unlink()
+    with (tmp_path / "archive" / "traffic.jsonl").open("a") as handle:
+        handle.write('{"key": "trunc')
+
+    reopened = TrafficArchive(tmp_path / "archive")
+    assert len(reopened) == 2
+    assert [record["prompt"] for record in reopened] == ["a", "b"]
+
+
+def test_replay_can_reproduce_recorded_latency(tmp_path):
+    archive = TrafficArchive(tmp_path / "archive")
+    archive.append(
+        {
+            "key": ReplayLLMClient(archive, "m")._key("s", "p", 0.0, None),
+            "response": "slow answer",
+            "latency": 0.05,
+            "first_token": 0.03,
+        }
+    )
+    replay = ReplayLLMClient(archive, "m", reproduce_latency=True)
+
+    async def consume():
+        started = time.perf_counter()
+        chunks = [chunk async for chunk in replay.stream(system="s", prompt="p", temperature=0.0, max_tokens=None)]
+        return chunks, time.perf_counter() - started
+
+    chunks, elapsed = asyncio.run(consume())
+    assert "".join(chunks) == "slow answer"
+    assert elapsed >= 0.05
+
+
+def test_streams_closed_early_are_recorded_and_replayed(tmp_path):
+    profile = LatencyProfile(median_latency=0.001, latency_sigma=0.1, tokens_per_second=1e5, completion_tokens=200)
+    scenarios = list(generate_scenarios(4, values_per_scenario=2))
+
+    def run_streamed(client):
+        config = ExperimentConfig(
+            scenarios=scenarios,
+            strategies=[StrategyConfig(name="ranked_values")],
+            llm_model=client.model,
+            stream_responses=True,
+        )
+        runner = ExperimentRunner(config=config, client=client)
+        return asyncio.run(runner.run()), runner
+
+    archive = TrafficArchive(tmp_path / "archive")
+    recorded, runner = run_streamed(RecordingLLMClient(synthetic_client(profile, seed=2), archive))
+    assert runner.early_stops > 0
+    truncated = [record for record in archive if record["truncated"]]
+    assert len(archive) == 8 and len(truncated) == runner.early_stops
+
+    replay = ReplayLLMClient(archive, "synthetic")
+    replayed, _ = run_streamed(replay)
+    assert replay.misses == 0
+    assert replayed["ranked_values"].to_dict() == recorded["ranked_values"].to_dict()
+
+    record = truncated[0]
+    with pytest.raises(ReplayMissError):
+        asyncio.run(
+            ReplayLLMClient(archive, "synthetic").generate(
+                system=record["system"], prompt=record["prompt"], temperature=0.0, max_tokens=None
+            )
+        )
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import random
+import tracemalloc
+
+from pref_gap_experiments import AlignmentReport, ExperimentConfig, ExperimentRunner, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.evaluation import AlignmentResult
+from pref_gap_experiments.llm import LLMClient
+from pref_gap_experiments.stats import bootstrap_interval
+
+
+class CyclingClient(LLMClient):
+    """Returns responses from a fixed cycle so sample scores vary deterministically."""
+
+    model = "cycling"
+
+    def __init__(self, responses):
+        self.responses = itertools.cycle(responses)
+        self.calls = 0
+
+    async def generate(self, *, system, prompt, temperature, max_tokens):
+        self.calls += 1
+        return next(self.responses)
+
+
+def build_config(**overrides):
+    scenarios = list(ScenarioDataset.from_file("data/scenarios.json"))[:1]
+    return ExperimentConfig(
+        scenarios=scenarios,
+        strategies=[StrategyConfig(name="baseline")],
+        llm_model="cycling",
+        temperature=0.7,
+        concurrent_queries=False,
+        **overrides,
+    )
+
+
+def test_fixed_sample_count_averages_scores():
+    client = CyclingClient(["Transparency", "Transparency and persuasion"])
+    reports = asyncio.run(ExperimentRunner(config=build_config(samples_per_scenario=4), client=client).run())
+
+    result = reports["baseline"].results[0]
+    assert client.calls == 8
+    assert len(result.sample_scores) == 4
+    assert result.score == sum(result.sample_scores) / 4
+    assert result.notes["samples"] == "4"
+    assert "statistics" in reports["baseline"].to_dict()
+
+
+def test_early_stopping_halts_once_interval_is_tight():
+    client = CyclingClient(["Transparency"])
+    config = build_config(samples_per_scenario=20, min_samples=3, target_ci_half_width=0.05)
+    reports = asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    assert len(reports["baseline"].results[0].sample_scores) == 3
+    assert client.calls == 6
+
+
+def test_report_statistics_and_single_sample_serialization():
+    results = [AlignmentResult(f"s{i}", "", "", score, {}) for i, score in enumerate([0.0, 0.5, 1.0, 0.5])]
+    report = AlignmentReport(results)
+    stats = report.statistics(resamples=500)
+
+    assert stats["mean"] == 0.5
+    assert stats["ci_low"] <= 0.5 <= stats["ci_high"]
+    assert "sample_scores" not in report.to_dict()["results"][0]
+    assert "statistics" not in report.to_dict()
+
+
+def test_bootstrap_memory_is_bounded_for_large_reports():
+    values = [random.Random(index).random() for index in range(20000)]
+    tracemalloc.start()
+    low, high = bootstrap_interval(values)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert low < sum(values) / len(values) < high
+    # Drawing all 2000 x 20000 resample indices at once would need over 300 MB.
+    assert peak < 64 * 2**20
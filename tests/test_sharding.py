@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import replace
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, MockLLMClient, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.sharding import merge_shard_reports, run_sharded
+
+
+def build_bank(path, count):
+    with path.open("w") as handle:
+        for index in range(count):
+            scenario = {
+                "identifier": f"scenario-{index}",
+                "stated_preference_prompt": f"stated {index}",
+                "conflict_prompt": f"conflict {index}",
+                "target_ranking": ["Alpha", "Beta"],
+                "evaluation_instructions": "",
+            }
+            handle.write(json.dumps(scenario) + "\n")
+
+
+def scripted_client():
+    responses = {f"You are a helpful assistant.\n\nconflict {index}": "Alpha" for index in range(0, 20, 3)}
+    return MockLLMClient(scripted_responses=responses)
+
+
+def test_sharded_run_matches_single_process_run(tmp_path):
+    path = tmp_path / "bank.jsonl"
+    build_bank(path, 11)
+    config = ExperimentConfig(
+        scenarios=ScenarioDataset.stream(path),
+        strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="safety_append")],
+        llm_model="mock",
+    )
+    expected = asyncio.run(ExperimentRunner(config=config, client=scripted_client()).run())
+
+    merged = run_sharded(path, config, scripted_client, 3)
+
+    assert list(merged) == list(expected)
+    for name, report in expected.items():
+        assert merged[name].results == report.results
+        assert merged[name].average_score == report.average_score
+
+
+def test_merge_is_independent_of_completion_order(tmp_path):
+    path = tmp_path / "bank.jsonl"
+    build_bank(path, 7)
+    shards = {}
+    for index in (2, 0, 1):
+        config = ExperimentConfig(
+            scenarios=ScenarioDataset.stream(path, shard=(index, 3)),
+            strategies=[StrategyConfig(name="baseline")],
+            llm_model="mock",
+        )
+        shards[index] = asyncio.run(ExperimentRunner(config=config, client=scripted_client()).run())
+
+    forward = merge_shard_reports(shards)
+    backward = merge_shard_reports(dict(reversed(list(shards.items()))))
+    assert forward["baseline"].results == backward["baseline"].results
+    assert [result.scenario_id for result in forward["baseline"].results] == [f"scenario-{i}" for i in range(7)]
+
+
+def test_process_budgets_are_split_between_workers():
+    from pref_gap_experiments.cli import build_parser, split_budgets
+
+    args = build_parser().parse_args(
+        ["bank.jsonl", "config.json", "--processes", "4", "--requests-per-minute", "600"]
+    )
+    config = ExperimentConfig(scenarios=[], strategies=[], llm_model="mock", parallelism=10)
+    worker_config, worker_args = split_budgets(config, args, 4)
+    assert worker_config.parallelism == 2
+    assert worker_args.requests_per_minute == 150
+    assert worker_args.tokens_per_minute is None
+    assert args.requests_per_minute == 600 and config.parallelism == 10
+    assert split_budgets(replace(config, parallelism=2), args, 4)[0].parallelism == 1
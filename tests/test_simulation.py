@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, StrategyConfig
+from pref_gap_experiments.simulation import LatencyProfile, generate_scenarios, synthetic_client
+
+
+def test_generate_scenarios_is_reproducible():
+    first = list(generate_scenarios(5, seed=3))
+    assert first == list(generate_scenarios(5, seed=3))
+    assert len({scenario.identifier for scenario in first}) == 5
+    assert all(len(scenario.target_ranking) == 4 for scenario in first)
+
+
+def test_synthetic_client_injects_errors_that_are_retried():
+    profile = LatencyProfile(median_latency=0.001, latency_sigma=0.1, error_rate=0.3, completion_tokens=8)
+    client = synthetic_client(profile, seed=1)
+    config = ExperimentConfig(
+        scenarios=list(generate_scenarios(10)),
+        strategies=[StrategyConfig(name="baseline")],
+        llm_model="synthetic",
+        parallelism=8,
+    )
+    reports = asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    completions = client._client.completions
+    assert len(reports["baseline"].results) == 10
+    assert completions.failures > 0
+    assert client.retries == completions.failures
+    assert completions.calls == 20 + completions.failures
+
+
+def test_cached_prompt_tokens_are_recorded_in_the_report():
+    profile = LatencyProfile(median_latency=0.001, latency_sigma=0.1, completion_tokens=8, cache_min_tokens=1)
+    client = synthetic_client(profile)
+    config = ExperimentConfig(
+        scenarios=list(generate_scenarios(6)),
+        strategies=[StrategyConfig(name="ranked_values")],
+        llm_model="synthetic",
+        parallelism=1,
+        system_values=[f"Value {index}: a long, shared description of a principle" for index in range(20)],
+    )
+    reports = asyncio.run(ExperimentRunner(config=config, client=client).run())
+
+    usage = reports["ranked_values"].to_dict()["token_usage"]
+    system_tokens = len(reports["ranked_values"].results[0].notes["system_prompt"]) // 4
+    assert system_tokens >= 128
+    # Every call after the first reuses the shared system prompt.
+    assert usage["cached_tokens"] == 11 * (system_tokens - system_tokens % 128)
+    assert reports["ranked_values"].results[-1].notes["cached_tokens"] == str(2 * (system_tokens - system_tokens % 128))
+
+
+def test_streamed_responses_stop_once_every_value_is_mentioned():
+    from pref_gap_experiments.telemetry import Telemetry
+
+    profile = LatencyProfile(median_latency=0.001, latency_sigma=0.1, tokens_per_second=1e5, completion_tokens=200)
+    scenarios = list(generate_scenarios(4, values_per_scenario=2))
+
+    def run(stream):
+        client = synthetic_client(profile, seed=2)
+        config = ExperimentConfig(
+            scenarios=scenarios,
+            strategies=[StrategyConfig(name="ranked_values")],
+            llm_model="synthetic",
+            stream_responses=stream,
+        )
+        telemetry = Telemetry()
+        runner = ExperimentRunner(config=config, client=client, telemetry=telemetry)
+        return asyncio.run(runner.run()), runner, client._client.completions, telemetry
+
+    full, _, _, _ = run(False)
+    streamed, runner, completions, telemetry = run(True)
+
+    assert runner.early_stops > 0
+    assert completions.streamed_tokens < 8 * 200
+    assert telemetry.summary()["llm.first_token"].count == 8
+    # Stopping after every value is mentioned leaves the scores unchanged.
+    assert streamed["ranked_values"].scores == full["ranked_values"].scores
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from pref_gap_experiments import ExperimentConfig, ExperimentRunner, ScenarioDataset, StrategyConfig
+from pref_gap_experiments.llm import OpenAIClient
+from pref_gap_experiments.telemetry import Telemetry
+
+
+class FakeCompletions:
+    async def create(self, **kwargs):
+        await asyncio.sleep(0.001)
+        message = SimpleNamespace(content="Transparency and patient safety first.")
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def test_runner_records_spans_tokens_and_trace(tmp_path):
+    fake = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    config = ExperimentConfig(
+        scenarios=list(ScenarioDataset.from_file("data/scenarios.json")),
+        strategies=[StrategyConfig(name="baseline"), StrategyConfig(name="ranked_values")],
+        llm_model="fake",
+        parallelism=2,
+    )
+    telemetry = Telemetry()
+    asyncio.run(ExperimentRunner(config=config, client=OpenAIClient("fake", client=fake), telemetry=telemetry).run())
+
+    summary = telemetry.summary()
+    assert summary["llm.generate"].count == 8
+    assert summary["llm.wait"].count == 8
+    assert summary["score"].count == 4
+    assert summary["llm.generate"].p50 <= summary["llm.generate"].p99
+    assert telemetry.totals("prompt_tokens") == 80
+    assert "llm.generate" in telemetry.format_summary()
+
+    trace_path = tmp_path / "trace.json"
+    telemetry.write_chrome_trace(trace_path)
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert {event["name"] for event in events} >= {"llm.generate", "score", "serialize"}
+
+
+def test_span_memory_is_bounded():
+    now = [0.0]
+    telemetry = Telemetry(clock=lambda: now[0], max_spans=100)
+    for index in range(50_000):
+        start = telemetry.now()
+        now[0] += 0.001 if index % 100 else 0.1
+        telemetry.record("llm.generate", start, prompt_tokens=2)
+
+    summary = telemetry.summary()["llm.generate"]
+    assert len(telemetry.spans) == 100
+    assert summary.count == 50_000
+    assert summary.max == pytest.approx(0.1)
+    assert summary.total == pytest.approx(49_500 * 0.001 + 500 * 0.1)
+    assert summary.p50 == pytest.approx(0.001)
+    assert telemetry.totals("prompt_tokens") == 100_000